@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ChatThread, UserMessage
+from .models import ChatThread, ThreadMessage, UserMessage
 
 @admin.register(ChatThread)
 class ChatThreadAdmin(admin.ModelAdmin):
@@ -42,4 +42,14 @@ class UserMessageAdmin(admin.ModelAdmin):
     list_filter = ("created_at",)
     ordering = ("-created_at",)
 
-    readonly_fields = ("id", "created_at")
\ No newline at end of file
+    readonly_fields = ("id", "created_at")
+
+
+@admin.register(ThreadMessage)
+class ThreadMessageAdmin(admin.ModelAdmin):
+    list_display = ("thread", "role", "content", "created_at")
+    search_fields = ("content", "thread__id")
+    list_filter = ("role", "created_at")
+    ordering = ("-id",)
+
+    readonly_fields = ("created_at",)
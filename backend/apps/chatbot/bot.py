@@ -1,37 +1,52 @@
+import asyncio
 import os
+import weakref
+from contextlib import asynccontextmanager
 from typing import Annotated, TypedDict
-from langgraph.graph import StateGraph, START, END
-from langgraph.graph.message import add_messages
-from langgraph.checkpoint.postgres import PostgresSaver
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.tools import Tool
-from langchain_google_community import GoogleSearchAPIWrapper
-
-from psycopg_pool import ConnectionPool
-from psycopg.rows import dict_row
+
+from django.conf import settings
 from dotenv import load_dotenv
 
-load_dotenv()
+from core import providers
 
-os.environ["GOOGLE_CSE_ID"] = os.environ.get("GOOGLE_CSE_ID") 
+load_dotenv()
 
-# Define the state
-class State(TypedDict):
-    messages: Annotated[list, add_messages]
+# LangChain, LangGraph and the Gemini SDK take seconds to import and the
+# model and pool need credentials, so they are imported and built on first
+# use through core.providers; importing this module stays cheap.
 
 # Initialize Gemini model
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    google_search={
-        "dynamic_retrieval_config": {
-            "mode": "MODE_DYNAMIC",
-            "dynamic_threshold": 0.3
-        }
-    },
-    google_api_key=os.getenv("GEMINI_API_KEY"))
+@providers.register("chatbot-llm")
+def chatbot_llm():
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.5-flash",
+        google_search={
+            "dynamic_retrieval_config": {
+                "mode": "MODE_DYNAMIC",
+                "dynamic_threshold": 0.3
+            }
+        },
+        google_api_key=os.getenv("GEMINI_API_KEY"))
+
+def with_system_prompt(messages, config):
+    from langchain_core.messages import SystemMessage
+
+    # Per-request system prompt (the employee's profile context); not stored in the thread state
+    system_prompt = config.get("configurable", {}).get("system_prompt")
+    if not system_prompt:
+        return messages
+    return [SystemMessage(content=system_prompt), *messages]
+
 
-def chatbot_node(state: State):
-    return {"messages": [llm.invoke(state["messages"])]}
+def chatbot_node(state, config):
+    llm = providers.get("chatbot-llm")
+    return {"messages": [llm.invoke(with_system_prompt(state["messages"], config))]}
+
+
+async def achatbot_node(state, config):
+    llm = providers.get("chatbot-llm")
+    return {"messages": [await llm.ainvoke(with_system_prompt(state["messages"], config))]}
 
 
 # # Initialize Google Search tool
@@ -78,25 +93,142 @@ def chatbot_node(state: State):
 #     return {"messages": [response]}
 
 # Setup the graph
-workflow = StateGraph(State)
-workflow.add_node("chatbot", chatbot_node)
-workflow.add_edge(START, "chatbot")
-workflow.add_edge("chatbot", END)
+@providers.register("chatbot-workflow")
+def chatbot_workflow():
+    from langchain_core.runnables import RunnableLambda
+    from langgraph.graph import StateGraph, START, END
+    from langgraph.graph.message import add_messages
+
+    # Define the state
+    class State(TypedDict):
+        messages: Annotated[list, add_messages]
+
+    workflow = StateGraph(State)
+    # Sync for graph.invoke, async for graph.astream (token streaming)
+    workflow.add_node("chatbot", RunnableLambda(chatbot_node, afunc=achatbot_node))
+    workflow.add_edge(START, "chatbot")
+    workflow.add_edge("chatbot", END)
+    return workflow
 
 # DB connection string from your existing Django environment
 DB_URI = f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
 
-# Create a connection pool with the required row_factory
-pool = ConnectionPool(
-    conninfo=DB_URI, 
-    max_size=20, 
-    kwargs={"autocommit": True, "row_factory": dict_row}
-)
-
-# Initialize checkpointer and compile graph
-checkpointer = PostgresSaver(pool)
-
-# NOTE: Run this once during deployment to create tables
-# checkpointer.setup() 
-
-graph = workflow.compile(checkpointer=checkpointer)
\ No newline at end of file
+@providers.register("chatbot-checkpointer")
+def chatbot_checkpointer():
+    from langgraph.checkpoint.postgres import PostgresSaver
+    from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool
+
+    # Create a connection pool with the required row_factory
+    pool = ConnectionPool(
+        conninfo=DB_URI, 
+        min_size=settings.CHECKPOINT_POOL_MIN_SIZE,
+        max_size=settings.CHECKPOINT_POOL_MAX_SIZE,
+        max_idle=settings.CHECKPOINT_POOL_MAX_IDLE,
+        kwargs={"autocommit": True, "row_factory": dict_row}
+    )
+
+    # NOTE: Run checkpointer.setup() once during deployment to create tables
+    # (see run_checkpointer_setup.py)
+    return PostgresSaver(pool)
+
+# Compile graph
+@providers.register("chatbot-graph")
+def chatbot_graph():
+    return providers.get("chatbot-workflow").compile(
+        checkpointer=providers.get("chatbot-checkpointer")
+    )
+
+
+def get_checkpointer():
+    return providers.get("chatbot-checkpointer")
+
+
+def get_graph():
+    return providers.get("chatbot-graph")
+
+
+# The sync PostgresSaver has no async methods, so async views get their own
+# checkpointer on an AsyncConnectionPool. Both use the same tables.
+#
+# The pool is opened on first use rather than at import, so processes that
+# never serve an async chat hold no connections, and it idles down to
+# CHECKPOINT_POOL_MIN_SIZE. psycopg async pools belong to the event loop that
+# opened them, hence one pool (and compiled graph) per loop; under uvicorn
+# that is one per worker process.
+_async_graphs = weakref.WeakKeyDictionary()
+
+
+async def _open_async_graph():
+    from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+    from psycopg.rows import dict_row
+    from psycopg_pool import AsyncConnectionPool
+
+    pool = AsyncConnectionPool(
+        conninfo=DB_URI,
+        min_size=settings.CHECKPOINT_POOL_MIN_SIZE,
+        max_size=settings.CHECKPOINT_POOL_MAX_SIZE,
+        timeout=settings.CHECKPOINT_POOL_TIMEOUT,
+        max_idle=settings.CHECKPOINT_POOL_MAX_IDLE,
+        # Health check: connections are tested before being handed out
+        check=AsyncConnectionPool.check_connection,
+        kwargs={"autocommit": True, "row_factory": dict_row},
+        name="langgraph-checkpoints",
+        open=False,
+    )
+    await pool.open()
+    workflow = providers.get("chatbot-workflow")
+    return pool, workflow.compile(checkpointer=AsyncPostgresSaver(pool))
+
+
+def _forget_failed_open(loop, opening):
+    # Don't keep a failed open around; the next request retries
+    if opening.cancelled() or opening.exception() is not None:
+        _async_graphs.pop(loop, None)
+
+
+async def _async_pool_and_graph():
+    loop = asyncio.get_running_loop()
+    opening = _async_graphs.get(loop)
+    if opening is None:
+        opening = _async_graphs[loop] = asyncio.ensure_future(_open_async_graph())
+        opening.add_done_callback(lambda task: _forget_failed_open(loop, task))
+    # Shielded so a cancelled request doesn't abort the open for everyone else
+    return await asyncio.shield(opening)
+
+
+async def get_async_pool():
+    pool, _ = await _async_pool_and_graph()
+    return pool
+
+
+async def get_async_graph():
+    _, compiled = await _async_pool_and_graph()
+    return compiled
+
+
+@asynccontextmanager
+async def async_graph():
+    yield await get_async_graph()
+
+
+async def check_async_pool():
+    """
+    Runs a trivial query through the pool; raises if the database is unreachable.
+    """
+    pool = await get_async_pool()
+    async with pool.connection() as conn:
+        await conn.execute("SELECT 1")
+
+
+def async_pool_stats():
+    """
+    Pool statistics (size, available, waiting, error counters...) of the
+    pools opened in this process, see psycopg_pool's ``get_stats()``.
+    """
+    stats = []
+    for opening in list(_async_graphs.values()):
+        if opening.done() and not opening.cancelled() and opening.exception() is None:
+            pool, _ = opening.result()
+            stats.append(pool.get_stats())
+    return stats
@@ -0,0 +1,159 @@
+"""
+Retention for the LangGraph checkpoint tables.
+
+PostgresSaver writes a checkpoint (plus channel blobs and pending writes)
+for every super-step of every thread and never removes any. Chat only ever
+needs the latest checkpoint of a thread, and the message history lives in
+ThreadMessage, so older checkpoints can go:
+
+- ``compact_threads`` keeps the newest ``keep`` checkpoints per thread and
+  namespace, then drops the writes and blobs no remaining checkpoint uses
+- ``delete_threads`` removes everything for threads whose ChatThread row
+  is gone
+
+Both return ``{table: (rows, bytes)}`` with the on-disk size of the deleted
+rows (``pg_column_size``). The tables are LangGraph's own, so this is plain
+SQL on the Django connection (same database).
+"""
+from apps.chatbot.models import ChatThread
+
+TABLES = ("checkpoints", "checkpoint_writes", "checkpoint_blobs")
+
+# Threads with more than %(keep)s checkpoints and no new one since %(idle_before)s
+COMPACTABLE_THREADS_SQL = """
+    SELECT thread_id
+    FROM checkpoints
+    WHERE thread_id > %(after)s
+    GROUP BY thread_id
+    HAVING count(*) > %(keep)s
+        AND max((checkpoint ->> 'ts')::timestamptz) < %(idle_before)s
+    ORDER BY thread_id
+    LIMIT %(limit)s
+"""
+
+ORPHANED_THREADS_SQL = """
+    SELECT thread_id
+    FROM (
+        SELECT thread_id FROM checkpoints
+        UNION SELECT thread_id FROM checkpoint_blobs
+        UNION SELECT thread_id FROM checkpoint_writes
+    ) AS threads
+    WHERE thread_id > %(after)s
+        AND NOT EXISTS (
+            SELECT 1 FROM {thread_table} t WHERE t.id::text = threads.thread_id
+        )
+    ORDER BY thread_id
+    LIMIT %(limit)s
+"""
+
+# checkpoint_id is a UUIDv6, so it sorts by creation time
+DELETE_OLD_CHECKPOINTS_SQL = """
+    WITH ranked AS (
+        SELECT thread_id, checkpoint_ns, checkpoint_id,
+            row_number() OVER (
+                PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+            ) AS position
+        FROM checkpoints
+        WHERE thread_id = ANY(%(threads)s)
+    ), deleted AS (
+        DELETE FROM checkpoints c
+        USING ranked r
+        WHERE c.thread_id = r.thread_id
+            AND c.checkpoint_ns = r.checkpoint_ns
+            AND c.checkpoint_id = r.checkpoint_id
+            AND r.position > %(keep)s
+        RETURNING pg_column_size(c.*) AS size
+    )
+    SELECT count(*), coalesce(sum(size), 0) FROM deleted
+"""
+
+DELETE_UNUSED_WRITES_SQL = """
+    WITH deleted AS (
+        DELETE FROM checkpoint_writes w
+        WHERE w.thread_id = ANY(%(threads)s)
+            AND NOT EXISTS (
+                SELECT 1 FROM checkpoints c
+                WHERE c.thread_id = w.thread_id
+                    AND c.checkpoint_ns = w.checkpoint_ns
+                    AND c.checkpoint_id = w.checkpoint_id
+            )
+        RETURNING pg_column_size(w.*) AS size
+    )
+    SELECT count(*), coalesce(sum(size), 0) FROM deleted
+"""
+
+# A blob belongs to a checkpoint through its channel_versions map
+DELETE_UNUSED_BLOBS_SQL = """
+    WITH deleted AS (
+        DELETE FROM checkpoint_blobs b
+        WHERE b.thread_id = ANY(%(threads)s)
+            AND NOT EXISTS (
+                SELECT 1
+                FROM checkpoints c, jsonb_each_text(c.checkpoint -> 'channel_versions') v
+                WHERE c.thread_id = b.thread_id
+                    AND c.checkpoint_ns = b.checkpoint_ns
+                    AND v.key = b.channel
+                    AND v.value = b.version
+            )
+        RETURNING pg_column_size(b.*) AS size
+    )
+    SELECT count(*), coalesce(sum(size), 0) FROM deleted
+"""
+
+DELETE_THREADS_SQL = """
+    WITH deleted AS (
+        DELETE FROM {table} x
+        WHERE x.thread_id = ANY(%(threads)s)
+        RETURNING pg_column_size(x.*) AS size
+    )
+    SELECT count(*), coalesce(sum(size), 0) FROM deleted
+"""
+
+TABLE_SIZE_SQL = "SELECT pg_total_relation_size(%s::regclass)"
+
+
+def _fetch_ids(cursor, sql, params):
+    cursor.execute(sql, params)
+    return [row[0] for row in cursor.fetchall()]
+
+
+def compactable_thread_ids(cursor, keep, idle_before, after="", limit=100):
+    return _fetch_ids(cursor, COMPACTABLE_THREADS_SQL, {
+        "keep": keep, "idle_before": idle_before, "after": after, "limit": limit,
+    })
+
+
+def orphaned_thread_ids(cursor, after="", limit=100):
+    sql = ORPHANED_THREADS_SQL.format(thread_table=ChatThread._meta.db_table)
+    return _fetch_ids(cursor, sql, {"after": after, "limit": limit})
+
+
+def _deleted(cursor, sql, params):
+    cursor.execute(sql, params)
+    rows, size = cursor.fetchone()
+    return rows, int(size)
+
+
+def compact_threads(cursor, thread_ids, keep):
+    params = {"threads": list(thread_ids), "keep": keep}
+    return {
+        "checkpoints": _deleted(cursor, DELETE_OLD_CHECKPOINTS_SQL, params),
+        "checkpoint_writes": _deleted(cursor, DELETE_UNUSED_WRITES_SQL, params),
+        "checkpoint_blobs": _deleted(cursor, DELETE_UNUSED_BLOBS_SQL, params),
+    }
+
+
+def delete_threads(cursor, thread_ids):
+    params = {"threads": list(thread_ids)}
+    return {
+        table: _deleted(cursor, DELETE_THREADS_SQL.format(table=table), params)
+        for table in TABLES
+    }
+
+
+def table_sizes(cursor):
+    sizes = {}
+    for table in TABLES:
+        cursor.execute(TABLE_SIZE_SQL, [table])
+        sizes[table] = cursor.fetchone()[0]
+    return sizes
@@ -0,0 +1,83 @@
+"""
+Thread history backed by the append-only ThreadMessage table.
+
+Chat views append each user turn as it arrives and each AI reply, with its
+token usage and latency, once the graph has produced it (``arecord_reply``).
+Both are written before the response completes, so ids follow the
+conversation order that pages rely on.
+
+Reading a page of history is then one indexed query
+(``thread = ? AND id < before ORDER BY id DESC LIMIT n``) however long the
+thread is, instead of loading and deserializing the whole LangGraph
+checkpoint. Threads that predate the table are copied from their checkpoint
+once, on first read.
+"""
+from django.db import transaction
+
+from apps.chatbot.bot import get_graph
+from apps.chatbot.models import ChatThread, ThreadMessage
+
+
+async def arecord_reply(thread, reply, latency_ms):
+    """
+    Appends the AI ``reply`` (an AIMessage, or the merged chunks of a
+    streamed one) to ``thread``'s history with its usage, in one insert.
+    """
+    usage = reply.usage_metadata or {}
+    return await ThreadMessage.objects.acreate(
+        thread=thread,
+        role='ai',
+        content=reply.text,
+        input_tokens=usage.get('input_tokens'),
+        output_tokens=usage.get('output_tokens'),
+        latency_ms=latency_ms,
+    )
+
+
+def index_thread_history(thread):
+    """
+    Rebuilds ``thread``'s ThreadMessage rows from its checkpoint and marks
+    it as indexed.
+    """
+    state = get_graph().get_state({"configurable": {"thread_id": str(thread.id)}})
+    rows = []
+    for message in state.values.get("messages", []):
+        if message.type not in ("human", "ai"):
+            continue
+        usage = getattr(message, "usage_metadata", None) or {}
+        rows.append(ThreadMessage(
+            thread=thread,
+            role=message.type,
+            content=message.text,
+            input_tokens=usage.get('input_tokens'),
+            output_tokens=usage.get('output_tokens'),
+        ))
+
+    with transaction.atomic():
+        ThreadMessage.objects.filter(thread=thread).delete()
+        ThreadMessage.objects.bulk_create(rows)
+        ChatThread.objects.filter(pk=thread.pk).update(history_indexed=True)
+    thread.history_indexed = True
+
+
+def thread_history_page(thread, limit, before=None):
+    """
+    Returns ``(messages, has_more)``: up to ``limit`` messages older than
+    message id ``before`` (the newest ones without it), oldest first.
+    """
+    if not thread.history_indexed:
+        index_thread_history(thread)
+
+    messages = ThreadMessage.objects.filter(thread=thread)
+    if before is not None:
+        messages = messages.filter(id__lt=before)
+
+    page = list(
+        messages
+        .order_by('-id')
+        .values('id', 'role', 'content', 'created_at')[:limit + 1]
+    )
+    has_more = len(page) > limit
+    page = page[:limit]
+    page.reverse()
+    return page, has_more
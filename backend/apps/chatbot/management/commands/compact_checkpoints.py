@@ -0,0 +1,149 @@
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.chatbot.checkpoints import (
+    TABLES,
+    compact_threads,
+    compactable_thread_ids,
+    delete_threads,
+    orphaned_thread_ids,
+    table_sizes,
+)
+
+
+def _format_bytes(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f'{size:.0f} {unit}'
+        size /= 1024
+    return f'{size:.1f} GB'
+
+
+class Command(BaseCommand):
+    help = (
+        'Compact the LangGraph checkpoint tables: keep only the newest checkpoints of '
+        'each idle chatbot thread and delete the checkpoints of deleted threads.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep',
+            type=int,
+            default=settings.CHECKPOINT_RETENTION,
+            help='Checkpoints kept per thread',
+        )
+        parser.add_argument(
+            '--idle-minutes',
+            type=int,
+            default=settings.CHECKPOINT_COMPACTION_IDLE_MINUTES,
+            help='Only compact threads with no checkpoint written in this many minutes',
+        )
+        parser.add_argument('--batch-size', type=int, default=200, help='Threads per transaction')
+        parser.add_argument('--sleep', type=float, default=0.5, help='Seconds to pause between batches')
+        parser.add_argument(
+            '--skip-orphans',
+            action='store_true',
+            help='Do not delete checkpoints of threads that no longer exist',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would be deleted, then roll back',
+        )
+
+    def handle(self, *args, **options):
+        if options['keep'] < 1:
+            raise CommandError('--keep must be at least 1; the latest checkpoint is the thread state.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
+        self.batch_size = options['batch_size']
+        self.sleep = options['sleep']
+        self.dry_run = options['dry_run']
+        self.totals = defaultdict(lambda: [0, 0])
+
+        with connection.cursor() as cursor:
+            sizes_before = table_sizes(cursor)
+
+        idle_before = timezone.now() - timedelta(minutes=options['idle_minutes'])
+        started = time.monotonic()
+        compacted = self._run_batches(
+            lambda cursor, after: compactable_thread_ids(
+                cursor, options['keep'], idle_before, after=after, limit=self.batch_size
+            ),
+            lambda cursor, thread_ids: compact_threads(cursor, thread_ids, options['keep']),
+        )
+        self.stdout.write(
+            f'Compacted {compacted} thread(s) to their {options["keep"]} newest checkpoint(s) '
+            f'in {time.monotonic() - started:.1f}s'
+        )
+
+        if not options['skip_orphans']:
+            started = time.monotonic()
+            orphaned = self._run_batches(
+                lambda cursor, after: orphaned_thread_ids(cursor, after=after, limit=self.batch_size),
+                delete_threads,
+            )
+            self.stdout.write(
+                f'Deleted checkpoints of {orphaned} deleted thread(s) '
+                f'in {time.monotonic() - started:.1f}s'
+            )
+
+        self._report(sizes_before)
+
+    def _run_batches(self, next_batch, process):
+        """
+        Walks thread ids in order, one transaction per batch, so locks are
+        held briefly and a long run can be interrupted without losing work.
+        """
+        processed = 0
+        after = ''
+        while True:
+            with transaction.atomic(), connection.cursor() as cursor:
+                thread_ids = next_batch(cursor, after)
+                if not thread_ids:
+                    return processed
+
+                for table, (rows, size) in process(cursor, thread_ids).items():
+                    self.totals[table][0] += rows
+                    self.totals[table][1] += size
+
+                if self.dry_run:
+                    transaction.set_rollback(True)
+
+            processed += len(thread_ids)
+            after = thread_ids[-1]
+            if len(thread_ids) < self.batch_size:
+                return processed
+            if self.sleep:
+                time.sleep(self.sleep)
+
+    def _report(self, sizes_before):
+        with connection.cursor() as cursor:
+            sizes_after = table_sizes(cursor)
+
+        verb = 'Would delete' if self.dry_run else 'Deleted'
+        self.stdout.write('')
+        for table in TABLES:
+            rows, size = self.totals[table]
+            self.stdout.write(
+                f'{table:<18} {verb.lower()} {rows} row(s), {_format_bytes(size)}; '
+                f'table {_format_bytes(sizes_before[table])} -> {_format_bytes(sizes_after[table])}'
+            )
+
+        rows = sum(rows for rows, _ in self.totals.values())
+        size = sum(size for _, size in self.totals.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'\n{verb} {rows} row(s), {_format_bytes(size)} of checkpoint data.'
+        ))
+        if not self.dry_run and rows:
+            self.stdout.write(
+                'Postgres reuses the freed space after (auto)vacuum; '
+                'run VACUUM FULL on these tables to return it to the OS.'
+            )
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0002_chatdocument_usermessage'),
+    ]
+
+    operations = [
+        # Existing threads have no ThreadMessage rows yet; new ones start indexed
+        migrations.AddField(
+            model_name='chatthread',
+            name='history_indexed',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='chatthread',
+            name='history_indexed',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.CreateModel(
+            name='ThreadMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('human', 'Human'), ('ai', 'AI')], max_length=10)),
+                ('content', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('thread', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='chatbot.chatthread')),
+            ],
+            options={
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['thread', '-id'], name='chatbot_thr_thread__9dc6c1_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0003_threadmessage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='threadmessage',
+            name='input_tokens',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='threadmessage',
+            name='latency_ms',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='threadmessage',
+            name='output_tokens',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='threadmessage',
+            index=models.Index(fields=['thread', 'created_at'], name='chatbot_thr_thread__85f001_idx'),
+        ),
+    ]
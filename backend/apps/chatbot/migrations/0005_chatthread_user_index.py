@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0004_threadmessage_usage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatthread',
+            index=models.Index(fields=['user', '-created_at'], name='chatbot_cha_user_id_85307f_idx'),
+        ),
+    ]
@@ -9,9 +9,16 @@ class ChatThread(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     title = models.CharField(max_length=255, default="New Chat")
     created_at = models.DateTimeField(auto_now_add=True)
+    # False for threads started before ThreadMessage existed; their history
+    # is copied from the checkpoint on first read
+    history_indexed = models.BooleanField(default=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Thread list: WHERE user = ? ORDER BY created_at DESC
+            models.Index(fields=['user', '-created_at']),
+        ]
         
 
 # ========================================================
@@ -36,6 +43,43 @@ class UserMessage(models.Model):
         ]        
 
 
+# ========================================================
+# ThreadMessage Model
+#=======================================================        
+class ThreadMessage(models.Model):
+    """
+    Append-only, denormalized copy of a thread's conversation (user and AI
+    turns, with token usage and latency) so history, search and analytics
+    are plain indexed SQL instead of LangGraph checkpoint decoding. The
+    checkpoint remains the source of truth for the model's context.
+    """
+    ROLE_CHOICES = [
+        ('human', 'Human'),
+        ('ai', 'AI'),
+    ]
+
+    thread = models.ForeignKey(ChatThread, on_delete=models.CASCADE, related_name="messages")
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+    content = models.TextField()
+    # Usage and timing of the model call that produced an AI message; null for human ones
+    input_tokens = models.PositiveIntegerField(null=True, blank=True)
+    output_tokens = models.PositiveIntegerField(null=True, blank=True)
+    latency_ms = models.PositiveIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-id']
+        indexes = [
+            # Newest-first pages of one thread: WHERE thread = ? AND id < ? ORDER BY id DESC
+            models.Index(fields=['thread', '-id']),
+            # Time-range history and analytics per thread
+            models.Index(fields=['thread', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.role}: {self.content[:50]}"
+
+
 # =======================================================
 # ChatDocument Model
 class ChatDocument(models.Model):
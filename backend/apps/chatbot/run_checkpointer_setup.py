@@ -1,4 +1,4 @@
-from apps.chatbot.bot import checkpointer
+from apps.chatbot.bot import get_checkpointer
 
-checkpointer.setup()
-print("LangGraph persistence tables created successfully!")
\ No newline at end of file
+get_checkpointer().setup()
+print("LangGraph persistence tables created successfully!")
@@ -1,11 +1,21 @@
 from django.urls import path
-from .views import ChatAPIView, ThreadListCreateView, ThreadDetailView
+from .views import (
+    ChatAPIView,
+    ChatStreamAPIView,
+    CheckpointPoolHealthView,
+    ThreadDetailView,
+    ThreadListCreateView,
+)
 
 urlpatterns = [
     # 1. The main chat endpoint (handles sending new & existing messages)
     path('chat/', ChatAPIView.as_view(), name='chatbot_chat'),
+    path('chat/stream/', ChatStreamAPIView.as_view(), name='chatbot_chat_stream'),
 
     # 2. Sidebar/History endpoints
     path('threads/', ThreadListCreateView.as_view(), name='thread_list'),
     path('threads/<uuid:pk>/', ThreadDetailView.as_view(), name='thread_detail'),
+
+    # 3. Monitoring
+    path('checkpoints/health/', CheckpointPoolHealthView.as_view(), name='checkpoint_pool_health'),
 ]
\ No newline at end of file
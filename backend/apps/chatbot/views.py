@@ -1,19 +1,73 @@
-from rest_framework.views import APIView
+import logging
+import time
+
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework import generics, status, serializers
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from adrf.views import APIView as AsyncAPIView
 
 from drf_spectacular.utils import (
     extend_schema,
     extend_schema_view,
+    OpenApiParameter,
     OpenApiResponse,
     inline_serializer,
 )
 
 
-from .models import ChatThread, UserMessage
+from .models import ChatThread, ThreadMessage, UserMessage
 from .serializers import ChatThreadSerializer
-from apps.chatbot.bot import graph
+from apps.chatbot.bot import async_graph, async_pool_stats, check_async_pool, get_checkpointer
+from apps.chatbot.history import arecord_reply, thread_history_page
+from apps.employees.context import aget_employee_context
+from core.concurrency import ConcurrencyLimit, ServiceOverloaded
+from core.sse import EventStreamRenderer, sse_event, sse_response
+
+logger = logging.getLogger(__name__)
+
+
+async def agraph_config(user, thread_id):
+    config = {"configurable": {"thread_id": thread_id}}
+
+    # Personalise with the employee's cached profile context, when there is one
+    employee_context = await aget_employee_context(user)
+    if employee_context and employee_context.system_instruction:
+        config["configurable"]["system_prompt"] = employee_context.system_instruction
+
+    return config
+
+
+async def aget_or_create_thread(user, thread_id, user_message):
+    """
+    Returns the user's thread (a new one when ``thread_id`` is empty) after
+    saving ``user_message`` to it, or None if the thread is not the user's.
+    """
+    # 1. Handle Thread Creation
+    if not thread_id:
+        # First time chatting? Create a entry in our Django Metadata table
+        thread = await ChatThread.objects.acreate(
+            user=user, 
+            title=user_message[:30] + "..." # Use first 30 chars as temporary title
+        )
+    else:
+        # Security Check: Ensure this user actually owns this thread
+        thread = await ChatThread.objects.filter(id=thread_id, user=user).afirst()
+        if not thread:
+            return None
+
+    # Save ONLY the user's message
+    await UserMessage.objects.acreate(
+        thread=thread,
+        user=user,
+        content=user_message
+    )
+    # History index for ThreadDetailView; the AI turn is added once generated
+    await ThreadMessage.objects.acreate(thread=thread, role='human', content=user_message)
+    return thread
+
 
 
 # =========================================================
@@ -50,9 +104,20 @@ class ThreadListCreateView(generics.ListCreateAPIView):
 @extend_schema(
     summary="Retrieve chat thread with messages",
     description=(
-        "Retrieve a specific chat thread along with its conversation history "
-        "stored in LangGraph persistence."
+        "Retrieve a specific chat thread along with a page of its conversation "
+        "history, newest page first and messages oldest first within the page. "
+        "Pass `next_before` back as `before` to load the previous page."
     ),
+    parameters=[
+        OpenApiParameter(
+            "before", int, required=False,
+            description="Only return messages older than this message id",
+        ),
+        OpenApiParameter(
+            "limit", int, required=False,
+            description="Page size (default THREAD_HISTORY_PAGE_SIZE, max THREAD_HISTORY_MAX_PAGE_SIZE)",
+        ),
+    ],
     responses=inline_serializer(
         name="ThreadDetailResponse",
         fields={
@@ -61,40 +126,76 @@ class ThreadListCreateView(generics.ListCreateAPIView):
                 name="ChatMessage",
                 many=True,
                 fields={
+                    "id": serializers.IntegerField(
+                        help_text="Message id, usable as a `before` cursor"
+                    ),
                     "role": serializers.CharField(
-                        help_text="Message role (user / assistant)"
+                        help_text="Message role (human / ai)"
                     ),
                     "content": serializers.CharField(
                         help_text="Message text"
                     ),
+                    "created_at": serializers.DateTimeField(),
                 },
             ),
+            "has_more": serializers.BooleanField(
+                help_text="Whether older messages exist"
+            ),
+            "next_before": serializers.IntegerField(
+                allow_null=True,
+                help_text="Cursor for the previous page, null on the first message"
+            ),
         },
     ),
     tags=["Chat Threads"],
 )
 class ThreadDetailView(generics.RetrieveDestroyAPIView):
-    queryset = ChatThread.objects.all()
     serializer_class = ChatThreadSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        # Other users' threads are a 404, not a 403
+        return ChatThread.objects.filter(user=self.request.user)
+
+    def get_page_params(self):
+        try:
+            limit = int(self.request.query_params.get("limit", settings.THREAD_HISTORY_PAGE_SIZE))
+            before = self.request.query_params.get("before")
+            before = int(before) if before else None
+        except ValueError:
+            raise ValidationError({"error": "`limit` and `before` must be integers."})
+
+        if not 1 <= limit <= settings.THREAD_HISTORY_MAX_PAGE_SIZE:
+            raise ValidationError({
+                "error": f"`limit` must be between 1 and {settings.THREAD_HISTORY_MAX_PAGE_SIZE}."
+            })
+        return limit, before
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
-        config = {"configurable": {"thread_id": str(instance.id)}}
-        
-        # Pull history directly from LangGraph persistence
-        state = graph.get_state(config)
-        messages = state.values.get("messages", [])
-        
-        # Format for frontend
-        formatted_messages = [
-            {"role": m.type, "content": m.content} for m in messages
-        ]
-        
+        limit, before = self.get_page_params()
+
+        # One indexed query on the message index, not the whole checkpoint
+        messages, has_more = thread_history_page(instance, limit, before)
+
         return Response({
             "thread": self.get_serializer(instance).data,
-            "messages": formatted_messages
+            "messages": messages,
+            "has_more": has_more,
+            "next_before": messages[0]["id"] if has_more else None
         })
 
+    def perform_destroy(self, instance):
+        thread_id = str(instance.id)
+        instance.delete()
+
+        # The LangGraph checkpoints aren't tied to the row; drop them too.
+        # If this fails, compact_checkpoints removes them as orphans later.
+        try:
+            get_checkpointer().delete_thread(thread_id)
+        except Exception:
+            logger.exception("Deleting checkpoints of thread %s failed", thread_id)
+
 
 # =========================================================
 # Chat with AI (LangGraph)
@@ -142,49 +243,181 @@ Send a message to the AI assistant.
     },
     tags=["Chat"],
 )
-class ChatAPIView(APIView):
+class ChatAPIView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
-    def post(self, request):
+    async def post(self, request):
         user_message = request.data.get("message")
         thread_id = request.data.get("thread_id") # Can be null for a new chat
 
         if not user_message:
              return Response({"error": "Message content is required"}, status=400)
          
-        # 1. Handle Thread Creation
-        if not thread_id:
-            # First time chatting? Create a entry in our Django Metadata table
-            thread = ChatThread.objects.create(
-                user=request.user, 
-                title=user_message[:30] + "..." # Use first 30 chars as temporary title
-            )
-            thread_id = str(thread.id)
-        else:
-            # Security Check: Ensure this user actually owns this thread
-            thread = ChatThread.objects.filter(id=thread_id, user=request.user).first()
-            if not thread:
-                return Response({"error": "Thread not found or unauthorized"}, status=404)
-
-        # Save ONLY the user's message
-        UserMessage.objects.create(
-            thread=thread,
-            user=request.user,
-            content=user_message
-        )
+        thread = await aget_or_create_thread(request.user, thread_id, user_message)
+        if not thread:
+            return Response({"error": "Thread not found or unauthorized"}, status=404)
+        thread_id = str(thread.id)
 
         # Invoke LangGraph
-        config = {"configurable": {"thread_id": thread_id}}
+        config = await agraph_config(request.user, thread_id)
         input_state = {"messages": [("user", user_message)]}
         
         # LangGraph automatically pulls history from Postgres using thread_id
-        output = graph.invoke(input_state, config=config)
+        async with ConcurrencyLimit("chat"), async_graph() as chat_graph:
+            started = time.monotonic()
+            output = await chat_graph.ainvoke(input_state, config=config)
+            latency_ms = int((time.monotonic() - started) * 1000)
 
         # Final AI Response
         ai_response = output["messages"][-1].content
+        await arecord_reply(thread, output["messages"][-1], latency_ms)
         
         return Response({
             "response": ai_response,
             "thread_id": thread_id,
             "title": thread.title
-        })
\ No newline at end of file
+        })
+
+
+# =========================================================
+# Chat with AI (LangGraph, streamed)
+# =========================================================
+
+@extend_schema(
+    summary="Chat with AI (streaming)",
+    description="""
+Same as `chat/`, but the AI response is streamed as Server-Sent Events:
+
+• `thread` – `{"thread_id", "title"}`, sent first
+• `token` – `{"text"}`, one per generated chunk
+• `done` – `{"response", "thread_id", "title"}` with the full response
+• `error` – `{"error"}` if generation fails
+
+Closing the connection stops generation.
+""",
+    request=inline_serializer(
+        name="ChatStreamRequest",
+        fields={
+            "message": serializers.CharField(
+                help_text="User message to send to the AI"
+            ),
+            "thread_id": serializers.UUIDField(
+                required=False,
+                allow_null=True,
+                help_text="Existing chat thread ID (optional)"
+            ),
+        },
+    ),
+    responses={
+        (200, "text/event-stream"): OpenApiResponse(
+            description="Server-Sent Events stream"
+        ),
+        404: OpenApiResponse(
+            description="Thread not found or unauthorized"
+        ),
+    },
+    tags=["Chat"],
+)
+class ChatStreamAPIView(AsyncAPIView):
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    async def post(self, request):
+        user_message = request.data.get("message")
+        thread_id = request.data.get("thread_id") # Can be null for a new chat
+
+        if not user_message:
+             return Response({"error": "Message content is required"}, status=400)
+
+        # The slot itself is taken by the stream; refuse early if none is free
+        if ConcurrencyLimit("chat").saturated():
+            raise ServiceOverloaded()
+
+        thread = await aget_or_create_thread(request.user, thread_id, user_message)
+        if not thread:
+            return Response({"error": "Thread not found or unauthorized"}, status=404)
+
+        config = await agraph_config(request.user, str(thread.id))
+        return sse_response(self.stream_events(thread, user_message, config))
+
+    async def stream_events(self, thread, user_message, config):
+        """
+        Events are produced on demand: the graph is only advanced when the
+        server asks for the next event, so a slow client holds back the model
+        instead of piling up chunks in memory. If the client disconnects,
+        Django cancels this generator and the graph stream (and with it the
+        Gemini request) is closed.
+        """
+        # LangChain is imported on first use, see apps.chatbot.bot
+        from langchain_core.messages import AIMessage
+
+        thread_id = str(thread.id)
+        yield sse_event("thread", {"thread_id": thread_id, "title": thread.title})
+
+        input_state = {"messages": [("user", user_message)]}
+
+        parts = []
+        # The chunks merged into one message, with the usage metadata
+        reply = None
+        try:
+            async with ConcurrencyLimit("chat"), async_graph() as stream_graph:
+                started = time.monotonic()
+                stream = stream_graph.astream(input_state, config=config, stream_mode="messages")
+                try:
+                    async for chunk, metadata in stream:
+                        # Only the model's reply, not the echoed input
+                        if not isinstance(chunk, AIMessage):
+                            continue
+                        reply = chunk if reply is None else reply + chunk
+                        if not chunk.text:
+                            continue
+                        parts.append(chunk.text)
+                        yield sse_event("token", {"text": chunk.text})
+                finally:
+                    await stream.aclose()
+                latency_ms = int((time.monotonic() - started) * 1000)
+        except Exception as e:
+            yield sse_event("error", {"error": str(e)})
+            return
+
+        if reply is not None:
+            await arecord_reply(thread, reply, latency_ms)
+
+        yield sse_event("done", {
+            "response": "".join(parts),
+            "thread_id": thread_id,
+            "title": thread.title
+        })
+
+
+# =========================================================
+# Checkpointer Pool Health
+# =========================================================
+
+@extend_schema(
+    summary="Checkpointer pool health",
+    description="""
+Checks the async LangGraph checkpointer pool of the worker that serves the
+request with a `SELECT 1` and returns its statistics (pool size, available
+and waiting connections, error counters). Opens the pool if it isn't yet.
+Admins only.
+""",
+    responses={
+        200: OpenApiResponse(description="Pool is healthy"),
+        503: OpenApiResponse(description="Database unreachable"),
+    },
+    tags=["Monitoring"],
+)
+class CheckpointPoolHealthView(AsyncAPIView):
+    permission_classes = [IsAdminUser]
+
+    async def get(self, request):
+        try:
+            await check_async_pool()
+        except Exception as e:
+            return Response(
+                {"status": "unavailable", "error": str(e), "pools": async_pool_stats()},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        return Response({"status": "ok", "pools": async_pool_stats()})
@@ -0,0 +1,151 @@
+"""
+Bounded conversation context for the Gemini chat.
+
+Each turn sends the chat's rolling ``summary`` plus the messages not yet
+folded into it, read with a single LIMITed query, so the prompt size and
+the DB work per turn do not grow with the chat.
+
+The window is the most recent messages that fit in CHAT_CONTEXT_TOKEN_BUDGET.
+Messages that fall out of it are folded into ``Chat.summary`` in the
+background once at least CHAT_SUMMARY_BATCH of them have piled up;
+``Chat.summarized_through`` records the last message already folded in.
+Until then they are still sent, over the budget, so every message is
+either in the history or in the summary.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from apps.chats.gemini_service import summarize_conversation
+from apps.chats.models import Chat, Message
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chat-summary")
+
+
+@dataclass
+class ChatContext:
+    # Every message after the summary, oldest first
+    history: List[Dict[str, str]] = field(default_factory=list)
+    summary: str = ''
+    # Id of the oldest message in the token-budgeted window; older ones are
+    # summary material
+    window_start_id: Optional[int] = None
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token plus per-message overhead; good enough for budgeting
+    return len(text) // 4 + 4
+
+
+def _recent_messages(chat: Chat):
+    return (
+        Message.objects
+        .filter(chat=chat, id__gt=chat.summarized_through or 0)
+        .order_by('-id')
+        .values_list('id', 'role', 'content')[:settings.CHAT_CONTEXT_MAX_MESSAGES]
+    )
+
+
+def _opening_with_user_turn(messages):
+    # Gemini expects the history to open with a user turn
+    while messages and messages[0][1] != 'user':
+        messages.pop(0)
+    return messages
+
+
+def _to_context(chat: Chat, recent) -> ChatContext:
+    recent = list(recent)
+    window = []
+    budget = settings.CHAT_CONTEXT_TOKEN_BUDGET - estimate_tokens(chat.summary)
+    for message_id, role, content in recent:
+        cost = estimate_tokens(content)
+        # Always keep the latest message, even if it alone exceeds the budget
+        if window and cost > budget:
+            break
+        window.append((message_id, role, content))
+        budget -= cost
+
+    window = _opening_with_user_turn(window[::-1])
+
+    # Messages past the window that are not in the summary yet are sent too
+    history = _opening_with_user_turn(recent[::-1])
+
+    return ChatContext(
+        history=[{"role": role, "content": content} for _, role, content in history],
+        summary=chat.summary,
+        window_start_id=window[0][0] if window else None,
+    )
+
+
+def build_chat_context(chat: Chat) -> ChatContext:
+    """
+    Returns the summary of ``chat`` and the messages after it, oldest first,
+    with the start of the token-budgeted window.
+    """
+    return _to_context(chat, _recent_messages(chat))
+
+
+async def abuild_chat_context(chat: Chat) -> ChatContext:
+    return _to_context(chat, [row async for row in _recent_messages(chat)])
+
+
+def fold_into_summary(chat_id: int) -> bool:
+    """
+    Folds messages that have fallen out of the window into the chat summary.
+    Returns True if the summary was updated.
+    """
+    chat = Chat.objects.filter(id=chat_id).first()
+    if chat is None:
+        return False
+
+    context = build_chat_context(chat)
+    if context.window_start_id is None:
+        return False
+
+    older = list(
+        Message.objects
+        .filter(
+            chat=chat,
+            id__gt=chat.summarized_through or 0,
+            id__lt=context.window_start_id,
+        )
+        .order_by('id')
+        .values_list('id', 'role', 'content')[:settings.CHAT_SUMMARY_MAX_MESSAGES]
+    )
+    if len(older) < settings.CHAT_SUMMARY_BATCH:
+        return False
+
+    summary = summarize_conversation(
+        chat.summary,
+        [{"role": role, "content": content} for _, role, content in older],
+    )
+
+    # Only apply if nobody folded in the meantime; update() leaves updated_at alone
+    updated = Chat.objects.filter(
+        id=chat.id,
+        summarized_through=chat.summarized_through,
+    ).update(summary=summary, summarized_through=older[-1][0])
+    return bool(updated)
+
+
+def _fold_in_background(chat_id):
+    close_old_connections()
+    try:
+        fold_into_summary(chat_id)
+    except Exception:
+        logger.exception("Summarizing chat %s failed", chat_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_summary(chat_id: int):
+    """
+    Updates the chat summary on a background thread, off the request path.
+    """
+    _executor.submit(_fold_in_background, chat_id)
@@ -1,81 +1,131 @@
+import hashlib
 import os
+import threading
 import warnings
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 
-# Suppress FutureWarning about deprecated google.generativeai package
-with warnings.catch_warnings():
-    warnings.simplefilter('ignore', FutureWarning)
-    import google.generativeai as genai
+from asgiref.sync import sync_to_async
+from django.conf import settings
 
+from apps.chats.prompt_cache import aget_cached_prompt, get_cached_prompt, get_provider
+from apps.employees.context import build_system_instruction
+from core import providers
+from core.cache import LRUCache
 
-def get_gemini_response(
-    chat_history: List[Dict[str, str]], 
-    user_message: str,
-    user_info: Optional[Dict[str, str]] = None
-) -> str:
+
+GEMINI_MODEL_NAME = 'gemini-2.5-flash'
+
+# Models are cheap to keep but hold no per-chat state, so one per
+# (model name, system instruction) is shared by every request in the process
+MODEL_CACHE_TTL = 24 * 3600
+
+_configure_lock = threading.Lock()
+_configured_api_key = None
+_models = LRUCache(max_entries=settings.GEMINI_MODEL_CACHE_SIZE)
+
+
+# The SDK is slow to import, so it is loaded on first use (see core/providers.py)
+@providers.register("generativeai")
+def generativeai_sdk():
+    # Suppress FutureWarning about deprecated google.generativeai package
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', FutureWarning)
+        import google.generativeai as genai
+    return genai
+
+
+def configure_gemini():
     """
-    Get a response from Gemini 2.5 Flash model.
-    
-    Args:
-        chat_history: List of previous messages in format [{"role": "user", "content": "..."}, ...]
-        user_message: The current user message
-        user_info: Optional dictionary containing user information (name, staff_id, department_name, designation_name)
-    
-    Returns:
-        The AI assistant's response
+    Configure the Gemini SDK once per process (again only if the key changes).
+    Reconfiguring drops the SDK's clients, so doing it per request would
+    open a new channel every time.
     """
+    global _configured_api_key
+    
     # Configure Gemini API
     api_key = os.getenv('GEMINI_API_KEY')
     if not api_key:
         raise ValueError("GEMINI_API_KEY not found in environment variables")
     
-    genai.configure(api_key=api_key)
-    
-    # Build system instruction with user information
-    system_instruction = None
-    if user_info:
-        context_parts = []
-        if user_info.get('name'):
-            context_parts.append(f"Name: {user_info['name']}")
-        if user_info.get('staff_id'):
-            context_parts.append(f"Staff ID: {user_info['staff_id']}")
-        if user_info.get('department_name'):
-            context_parts.append(f"Department: {user_info['department_name']}")
-        if user_info.get('designation_name'):
-            context_parts.append(f"Designation: {user_info['designation_name']}")
-        if user_info.get('job_description'):
-            context_parts.append(f"\nJob Description:\n{user_info['job_description']}")
-        
-        if context_parts:
-            system_instruction = (
-                "You are an internal AI assistant for GrowWise, a personal growth and development platform. "
-                "You have been explicitly provided with the following user profile information:\n\n" + 
-                "\n".join(context_parts) + 
-                "\n\nCRITICAL INSTRUCTIONS:\n"
-                "- You HAVE ACCESS to this user information and MUST use it when relevant.\n"
-                "- When the user asks about their staff ID, name, department, designation, or job responsibilities, you MUST provide this information directly.\n"
-                "- Do NOT say you don't have access to this information - you have been explicitly provided with it in this conversation.\n"
-                "- This is an internal company application, and you are authorized to share this user's own information with them.\n"
-                "- Use the job description to understand the user's role, responsibilities, and provide contextually relevant assistance.\n"
-                "- Use this information to provide personalized and context-aware assistance."
-            )
+    if api_key == _configured_api_key:
+        return
+    
+    with _configure_lock:
+        if api_key != _configured_api_key:
+            providers.get("generativeai").configure(api_key=api_key)
+            _models.clear()
+            _configured_api_key = api_key
+
+
+def get_gemini_model(system_instruction: Optional[str] = None):
+    """
+    Return ``(model, uses_system_instruction)`` from the process-wide registry.
+    
+    Models are keyed by model name and a hash of the system instruction and
+    evicted least-recently-used. All of them share the SDK's client, so the
+    underlying connection is reused across requests and threads.
+    """
+    configure_gemini()
+    genai = providers.get("generativeai")
+    
+    digest = hashlib.sha256(system_instruction.encode()).hexdigest() if system_instruction else None
+    key = (GEMINI_MODEL_NAME, digest)
+    
+    entry = _models.get(key)
+    if entry is not None:
+        return entry
     
     # Initialize the model with system instruction if available
     # Try using system_instruction parameter (available in newer versions)
-    use_system_instruction = False
     if system_instruction:
         try:
-            model = genai.GenerativeModel(
-                'gemini-2.5-flash',
-                system_instruction=system_instruction
+            entry = (
+                genai.GenerativeModel(GEMINI_MODEL_NAME, system_instruction=system_instruction),
+                True,
             )
-            use_system_instruction = True
         except (TypeError, AttributeError):
             # Fallback if system_instruction parameter is not supported
-            model = genai.GenerativeModel('gemini-2.5-flash')
-            use_system_instruction = False
+            entry = (genai.GenerativeModel(GEMINI_MODEL_NAME), False)
     else:
-        model = genai.GenerativeModel('gemini-2.5-flash')
+        entry = (genai.GenerativeModel(GEMINI_MODEL_NAME), False)
+    
+    _models.set(key, entry, MODEL_CACHE_TTL)
+    return entry
+
+
+def get_cached_gemini_model(cached_prompt: str):
+    """
+    Return a model bound to provider-side cached content (see apps.chats.prompt_cache).
+    """
+    configure_gemini()
+    
+    key = ("cached", cached_prompt)
+    model = _models.get(key)
+    if model is None:
+        model = get_provider().model(cached_prompt)
+        _models.set(key, model, MODEL_CACHE_TTL)
+    return model
+
+
+def start_gemini_chat(
+    chat_history: List[Dict[str, str]],
+    conversation_summary: Optional[str] = None,
+    system_instruction: Optional[str] = None,
+    cached_prompt: Optional[str] = None
+):
+    """
+    Create a Gemini chat session primed with the system instruction and chat history.
+    With cached_prompt, the name returned by apps.chats.prompt_cache, the
+    system instruction is sent as that cached content instead.
+    """
+    model = None
+    if cached_prompt:
+        try:
+            model, use_system_instruction = get_cached_gemini_model(cached_prompt), True
+        except Exception:
+            model = None
+    if model is None:
+        model, use_system_instruction = get_gemini_model(system_instruction)
     
     # Build conversation history in the format expected by Gemini
     history = []
@@ -92,6 +142,18 @@ def get_gemini_response(
             "parts": ["I understand. I have access to your profile information and will use it to provide personalized assistance. How can I help you today?"]
         })
     
+    # The summary travels with the history rather than the system instruction,
+    # which stays the same for every turn and can share one model
+    if conversation_summary:
+        history.append({
+            "role": "user",
+            "parts": [f"Summary of the earlier part of this conversation (older messages are not repeated):\n{conversation_summary}"]
+        })
+        history.append({
+            "role": "model",
+            "parts": ["Understood. I will keep this earlier context in mind."]
+        })
+    
     # Add previous chat history
     for msg in chat_history:
         role = "user" if msg["role"] == "user" else "model"
@@ -101,7 +163,55 @@ def get_gemini_response(
         })
     
     # Start chat with history
-    chat = model.start_chat(history=history)
+    return model.start_chat(history=history)
+
+
+async def _astart_gemini_chat(chat_history, user_info, conversation_summary, system_instruction, prompt_cache_key):
+    if system_instruction is None:
+        system_instruction = build_system_instruction(user_info)
+    # The prompt cache lookup uses the shared Django cache (possibly the
+    # database), so it stays on thread-sensitive code
+    cached_prompt = None
+    if system_instruction and prompt_cache_key:
+        cached_prompt = await aget_cached_prompt(*prompt_cache_key, GEMINI_MODEL_NAME, system_instruction)
+    
+    # Building the model may fetch the cached content from Gemini; that SDK
+    # call runs off the shared sync thread so other requests' ORM calls
+    # don't queue behind it
+    return await sync_to_async(start_gemini_chat, thread_sensitive=False)(
+        chat_history, conversation_summary, system_instruction, cached_prompt
+    )
+
+
+def get_gemini_response(
+    chat_history: List[Dict[str, str]], 
+    user_message: str,
+    user_info: Optional[Dict[str, str]] = None,
+    conversation_summary: Optional[str] = None,
+    system_instruction: Optional[str] = None,
+    prompt_cache_key: Optional[Tuple[int, str]] = None
+) -> str:
+    """
+    Get a response from Gemini 2.5 Flash model.
+    
+    Args:
+        chat_history: List of previous messages in format [{"role": "user", "content": "..."}, ...]
+        user_message: The current user message
+        user_info: Optional dictionary containing user information (name, staff_id, department_name, designation_name)
+        conversation_summary: Optional summary of the turns older than chat_history
+        system_instruction: Optional precomputed system instruction, used instead of user_info
+        prompt_cache_key: Optional (user id, context version) to serve the system instruction from the prompt cache
+    
+    Returns:
+        The AI assistant's response
+    """
+    if system_instruction is None:
+        system_instruction = build_system_instruction(user_info)
+    cached_prompt = None
+    if system_instruction and prompt_cache_key:
+        cached_prompt = get_cached_prompt(*prompt_cache_key, GEMINI_MODEL_NAME, system_instruction)
+    
+    chat = start_gemini_chat(chat_history, conversation_summary, system_instruction, cached_prompt)
     
     # Send the current user message and get response
     try:
@@ -110,3 +220,85 @@ def get_gemini_response(
     except Exception as e:
         raise Exception(f"Error calling Gemini API: {str(e)}")
 
+
+async def aget_gemini_response(
+    chat_history: List[Dict[str, str]], 
+    user_message: str,
+    user_info: Optional[Dict[str, str]] = None,
+    conversation_summary: Optional[str] = None,
+    system_instruction: Optional[str] = None,
+    prompt_cache_key: Optional[Tuple[int, str]] = None
+) -> str:
+    """
+    Async variant of get_gemini_response; the request to Gemini does not hold a thread.
+    """
+    chat = await _astart_gemini_chat(
+        chat_history, user_info, conversation_summary, system_instruction, prompt_cache_key
+    )
+    
+    try:
+        response = await chat.send_message_async(user_message)
+        return response.text
+    except Exception as e:
+        raise Exception(f"Error calling Gemini API: {str(e)}")
+
+
+async def stream_gemini_response(
+    chat_history: List[Dict[str, str]], 
+    user_message: str,
+    user_info: Optional[Dict[str, str]] = None,
+    conversation_summary: Optional[str] = None,
+    system_instruction: Optional[str] = None,
+    prompt_cache_key: Optional[Tuple[int, str]] = None
+) -> AsyncIterator[str]:
+    """
+    Stream a response from Gemini 2.5 Flash, yielding text chunks as they are generated.
+    
+    Takes the same arguments as get_gemini_response. Closing the generator
+    early (e.g. when the client disconnects) stops reading from Gemini.
+    """
+    chat = await _astart_gemini_chat(
+        chat_history, user_info, conversation_summary, system_instruction, prompt_cache_key
+    )
+    
+    try:
+        response = await chat.send_message_async(user_message, stream=True)
+        async for chunk in response:
+            # Chunks without text parts (e.g. the final one) raise on .text
+            if chunk.parts:
+                yield chunk.text
+    except Exception as e:
+        raise Exception(f"Error calling Gemini API: {str(e)}")
+
+
+def summarize_conversation(
+    previous_summary: str,
+    messages: List[Dict[str, str]]
+) -> str:
+    """
+    Fold older messages into the running conversation summary.
+    
+    Args:
+        previous_summary: The current summary (may be empty)
+        messages: Messages to add, oldest first, in format [{"role": "user", "content": "..."}, ...]
+    
+    Returns:
+        The updated summary
+    """
+    model, _ = get_gemini_model()
+    
+    transcript = "\n".join(f"{msg['role']}: {msg['content']}" for msg in messages)
+    prompt = (
+        "You maintain a running summary of a conversation between a user and an AI assistant. "
+        "Update the summary with the new messages below. Keep facts, decisions, the user's goals "
+        "and open questions; drop greetings and repetition. Write at most 250 words in plain prose.\n\n"
+        f"Current summary:\n{previous_summary or '(none)'}\n\n"
+        f"New messages:\n{transcript}\n\n"
+        "Updated summary:"
+    )
+    
+    try:
+        response = model.generate_content(prompt)
+        return response.text.strip()
+    except Exception as e:
+        raise Exception(f"Error calling Gemini API: {str(e)}")
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0002_fix_message_cascade'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chat',
+            name='summarized_through',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='chat',
+            name='summary',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chats', '0003_chat_summary'),
+        ('employees', '0002_employee_last_visited_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chat',
+            index=models.Index(fields=['employee', '-updated_at'], name='chats_staff_i_d3e944_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['chat', 'created_at'], name='messages_chat_id_ec31ea_idx'),
+        ),
+    ]
@@ -11,12 +11,20 @@ class Chat(models.Model):
         db_column='staff_id'
     )
     name = models.CharField(max_length=255)
+    # Rolling summary of the messages that no longer fit the context window,
+    # covering every message up to and including summarized_through (a Message id)
+    summary = models.TextField(blank=True, default='')
+    summarized_through = models.BigIntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'chats'
         ordering = ['-updated_at']
+        indexes = [
+            # Chat list: WHERE staff_id = ? ORDER BY updated_at DESC
+            models.Index(fields=['employee', '-updated_at']),
+        ]
 
     def __str__(self):
         return f"{self.employee.staff_id} - {self.name}"
@@ -41,6 +49,10 @@ class Message(models.Model):
     class Meta:
         db_table = 'messages'
         ordering = ['created_at']
+        indexes = [
+            # Chat history: WHERE chat = ? ORDER BY created_at
+            models.Index(fields=['chat', 'created_at']),
+        ]
 
     def __str__(self):
         return f"{self.chat.name} - {self.role} - {self.created_at}"
@@ -0,0 +1,283 @@
+"""
+Provider-side caching of the per-employee system instruction.
+
+The GrowWise system instruction (profile plus the full job description) is
+the same on every turn of every chat an employee has, so instead of sending
+and re-tokenising it each time it is uploaded once as Gemini cached content
+and chats reference it by name.
+
+Entries are keyed by user and ``EmployeeContext.version`` (which changes
+with the JD text and version) and recorded in the shared Django cache so all
+workers use the same provider entry. Their lifecycle:
+
+- created on first use, if the instruction is long enough to be cacheable;
+  one request creates it (a ``cache.add`` claim) while concurrent ones send
+  the instruction uncached
+- extended when used within GEMINI_PROMPT_CACHE_REFRESH_MARGIN of expiry
+- never deleted explicitly: a new context version gets a new key, and the
+  superseded entry, no longer extended, expires at its TTL; requests still
+  using it are unaffected
+
+``GEMINI_PROMPT_CACHE`` selects the provider: "gemini", "local" (an
+in-process fake for tests and development) or empty to disable.
+"""
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from core import providers
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "prompt-cache"
+
+# Longest a create/refresh claim is held if its holder dies mid-call
+CLAIM_TIMEOUT = 60
+
+
+@dataclass(frozen=True)
+class CachedPrompt:
+    name: str
+    expires_at: float
+
+
+# =========================
+# Providers
+# =========================
+class PromptCacheProvider(ABC):
+    @abstractmethod
+    def create(self, model_name, system_instruction, ttl) -> CachedPrompt:
+        pass
+
+    @abstractmethod
+    def refresh(self, name, ttl) -> CachedPrompt:
+        pass
+
+    @abstractmethod
+    def model(self, name):
+        """
+        Returns a GenerativeModel that uses the cached prompt ``name``.
+        """
+        pass
+
+
+class GeminiPromptCacheProvider(PromptCacheProvider):
+    def __init__(self):
+        from google.generativeai import caching
+        self._caching = caching
+
+    def create(self, model_name, system_instruction, ttl):
+        cached = self._caching.CachedContent.create(
+            model=f"models/{model_name}",
+            display_name="growwise-system-instruction",
+            system_instruction=system_instruction,
+            ttl=timedelta(seconds=ttl),
+        )
+        return CachedPrompt(cached.name, cached.expire_time.timestamp())
+
+    def refresh(self, name, ttl):
+        cached = self._caching.CachedContent.get(name)
+        cached.update(ttl=timedelta(seconds=ttl))
+        return CachedPrompt(cached.name, cached.expire_time.timestamp())
+
+    def model(self, name):
+        return providers.get("generativeai").GenerativeModel.from_cached_content(name)
+
+
+class LocalPromptCacheProvider(PromptCacheProvider):
+    """
+    In-process stand-in for the Gemini cache with the same lifecycle
+    (entries expire and can be refreshed). Models are built with a
+    plain system instruction, so chats behave exactly as without caching.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._counter = 0
+
+    def _live(self, name):
+        entry = self._entries.get(name)
+        if entry is None or entry["expires_at"] <= time.time():
+            raise KeyError(f"Cached prompt {name} not found")
+        return entry
+
+    def create(self, model_name, system_instruction, ttl):
+        with self._lock:
+            self._counter += 1
+            name = f"cachedContents/local-{self._counter}"
+            self._entries[name] = {
+                "model_name": model_name,
+                "system_instruction": system_instruction,
+                "expires_at": time.time() + ttl,
+            }
+            return CachedPrompt(name, self._entries[name]["expires_at"])
+
+    def refresh(self, name, ttl):
+        with self._lock:
+            entry = self._live(name)
+            entry["expires_at"] = time.time() + ttl
+            return CachedPrompt(name, entry["expires_at"])
+
+    def model(self, name):
+        with self._lock:
+            entry = self._live(name)
+        return providers.get("generativeai").GenerativeModel(
+            entry["model_name"],
+            system_instruction=entry["system_instruction"],
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+
+PROVIDERS = {
+    "gemini": GeminiPromptCacheProvider,
+    "local": LocalPromptCacheProvider,
+}
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_provider():
+    """
+    Returns the configured provider, or None when prompt caching is disabled.
+    """
+    global _provider
+    if not settings.GEMINI_PROMPT_CACHE:
+        return None
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = PROVIDERS[settings.GEMINI_PROMPT_CACHE]()
+    return _provider
+
+
+# =========================
+# Lifecycle
+# =========================
+def _entry_key(user_id, version):
+    return f"{CACHE_PREFIX}:{user_id}:{version}"
+
+
+def is_cacheable(system_instruction):
+    # Providers refuse to cache prompts below a minimum size; ~4 chars per token
+    return len(system_instruction) // 4 >= settings.GEMINI_PROMPT_CACHE_MIN_TOKENS
+
+
+def _is_fresh(entry):
+    return entry is not None and entry.expires_at - time.time() > settings.GEMINI_PROMPT_CACHE_REFRESH_MARGIN
+
+
+def _usable_name(entry):
+    return entry.name if entry is not None and entry.expires_at > time.time() else None
+
+
+def _should_cache(provider, system_instruction):
+    return provider is not None and system_instruction and is_cacheable(system_instruction)
+
+
+def get_cached_prompt(user_id, version, model_name, system_instruction):
+    """
+    Returns the name of the cached content holding ``system_instruction``
+    for this user and context version, creating or extending it as needed.
+    Returns None when caching is disabled, not worthwhile, failing or being
+    created by another request, in which case the caller sends the
+    instruction as usual. The cache is only an optimisation, so failures of
+    the shared cache or the provider are logged, never raised.
+    """
+    provider = get_provider()
+    if not _should_cache(provider, system_instruction):
+        return None
+
+    key = _entry_key(user_id, version)
+    ttl = settings.GEMINI_PROMPT_CACHE_TTL
+
+    try:
+        entry = cache.get(key)
+        if _is_fresh(entry):
+            return entry.name
+
+        # Single flight across threads and workers: only the claim holder calls
+        # the provider, the others use the current entry while it lasts
+        claim_key = f"{key}:claim"
+        if not cache.add(claim_key, True, timeout=CLAIM_TIMEOUT):
+            return _usable_name(entry)
+    except Exception:
+        logger.exception("Prompt cache read failed for user %s", user_id)
+        return None
+
+    try:
+        # Another request may have finished between our read and the claim
+        entry = cache.get(key)
+        if _is_fresh(entry):
+            return entry.name
+        if _usable_name(entry):
+            entry = provider.refresh(entry.name, ttl)
+        else:
+            entry = provider.create(model_name, system_instruction, ttl)
+        cache.set(key, entry, timeout=ttl)
+        return entry.name
+    except Exception:
+        logger.exception("Prompt caching failed for user %s", user_id)
+        return None
+    finally:
+        try:
+            cache.delete(claim_key)
+        except Exception:
+            logger.exception("Prompt cache claim release failed for user %s", user_id)
+
+
+async def aget_cached_prompt(user_id, version, model_name, system_instruction):
+    """
+    Async variant of ``get_cached_prompt``. The shared cache is used through
+    its async API (thread-sensitive, like the ORM); only the blocking
+    provider calls run on a worker thread.
+    """
+    provider = get_provider()
+    if not _should_cache(provider, system_instruction):
+        return None
+
+    key = _entry_key(user_id, version)
+    ttl = settings.GEMINI_PROMPT_CACHE_TTL
+
+    try:
+        entry = await cache.aget(key)
+        if _is_fresh(entry):
+            return entry.name
+
+        claim_key = f"{key}:claim"
+        if not await cache.aadd(claim_key, True, timeout=CLAIM_TIMEOUT):
+            return _usable_name(entry)
+    except Exception:
+        logger.exception("Prompt cache read failed for user %s", user_id)
+        return None
+
+    try:
+        entry = await cache.aget(key)
+        if _is_fresh(entry):
+            return entry.name
+        if _usable_name(entry):
+            entry = await sync_to_async(provider.refresh, thread_sensitive=False)(entry.name, ttl)
+        else:
+            entry = await sync_to_async(provider.create, thread_sensitive=False)(
+                model_name, system_instruction, ttl
+            )
+        await cache.aset(key, entry, timeout=ttl)
+        return entry.name
+    except Exception:
+        logger.exception("Prompt caching failed for user %s", user_id)
+        return None
+    finally:
+        try:
+            await cache.adelete(claim_key)
+        except Exception:
+            logger.exception("Prompt cache claim release failed for user %s", user_id)
@@ -0,0 +1,35 @@
+from django.test import SimpleTestCase, override_settings
+
+from apps.chats.context import _to_context
+from apps.chats.models import Chat
+
+
+def rows(count, start=1):
+    # Newest first, as _recent_messages returns them; 40 tokens each
+    return [
+        (message_id, ("user", "assistant")[(message_id - 1) % 2], "x" * 144)
+        for message_id in range(start + count - 1, start - 1, -1)
+    ]
+
+
+@override_settings(CHAT_CONTEXT_TOKEN_BUDGET=200, CHAT_SUMMARY_BATCH=10)
+class ChatContextTests(SimpleTestCase):
+    def test_short_chat_is_sent_whole(self):
+        context = _to_context(Chat(summary=""), rows(4))
+
+        self.assertEqual(len(context.history), 4)
+        self.assertEqual(context.window_start_id, 1)
+
+    def test_messages_past_the_window_are_sent_until_summarized(self):
+        # 5 messages fit the budget; the 3 older ones are below CHAT_SUMMARY_BATCH
+        context = _to_context(Chat(summary=""), rows(8))
+
+        self.assertEqual(len(context.history), 8)
+        self.assertEqual(context.window_start_id, 5)
+
+    def test_summarized_messages_are_not_repeated(self):
+        context = _to_context(Chat(summary="Earlier turns.", summarized_through=10), rows(4, start=11))
+
+        self.assertEqual(len(context.history), 4)
+        self.assertEqual(context.history[0]["role"], "user")
+        self.assertEqual(context.summary, "Earlier turns.")
@@ -0,0 +1,112 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from apps.chats import prompt_cache
+from apps.chats.prompt_cache import LocalPromptCacheProvider, aget_cached_prompt, get_cached_prompt
+
+INSTRUCTION = "You are GrowWise. " * 20
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHE,
+    GEMINI_PROMPT_CACHE="local",
+    GEMINI_PROMPT_CACHE_TTL=3600,
+    GEMINI_PROMPT_CACHE_REFRESH_MARGIN=600,
+    GEMINI_PROMPT_CACHE_MIN_TOKENS=10,
+)
+class GetCachedPromptTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.provider = LocalPromptCacheProvider()
+        patcher = mock.patch.object(prompt_cache, "_provider", self.provider)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_second_call_reuses_the_cached_content(self):
+        with mock.patch.object(self.provider, "create", wraps=self.provider.create) as create:
+            first = get_cached_prompt(1, "v1", "gemini-test", INSTRUCTION)
+            second = get_cached_prompt(1, "v1", "gemini-test", INSTRUCTION)
+
+        self.assertIsNotNone(first)
+        self.assertEqual(first, second)
+        self.assertEqual(create.call_count, 1)
+
+    def test_entry_close_to_expiry_is_refreshed_not_recreated(self):
+        name = get_cached_prompt(1, "v1", "gemini-test", INSTRUCTION)
+        cache.set(prompt_cache._entry_key(1, "v1"), prompt_cache.CachedPrompt(name, time.time() + 60))
+
+        with mock.patch.object(self.provider, "create") as create:
+            self.assertEqual(get_cached_prompt(1, "v1", "gemini-test", INSTRUCTION), name)
+
+        create.assert_not_called()
+        self.assertGreater(cache.get(prompt_cache._entry_key(1, "v1")).expires_at, time.time() + 600)
+
+    def test_version_bump_creates_new_content_and_keeps_the_old_one(self):
+        old = get_cached_prompt(1, "v1", "gemini-test", INSTRUCTION)
+        new = get_cached_prompt(1, "v2", "gemini-test", INSTRUCTION + "New JD.")
+
+        self.assertNotEqual(old, new)
+        # The superseded entry is left to expire, so in-flight chats keep working
+        self.assertEqual(len(self.provider), 2)
+        self.assertIsNotNone(self.provider._live(old))
+
+    async def test_async_variant_shares_the_entry(self):
+        with mock.patch.object(self.provider, "create", wraps=self.provider.create) as create:
+            first = await aget_cached_prompt(1, "v1", "gemini-test", INSTRUCTION)
+            second = await aget_cached_prompt(1, "v1", "gemini-test", INSTRUCTION)
+
+        self.assertIsNotNone(first)
+        self.assertEqual(first, second)
+        self.assertEqual(create.call_count, 1)
+        self.assertEqual(get_cached_prompt(1, "v1", "gemini-test", INSTRUCTION), first)
+
+    def test_short_instructions_are_not_cached(self):
+        self.assertIsNone(get_cached_prompt(1, "v1", "gemini-test", "Short."))
+        self.assertEqual(len(self.provider), 0)
+
+    def test_concurrent_first_calls_create_once(self):
+        create = self.provider.create
+        started = threading.Event()
+
+        def slow_create(*args, **kwargs):
+            started.set()
+            time.sleep(0.2)
+            return create(*args, **kwargs)
+
+        results = []
+        with mock.patch.object(self.provider, "create", side_effect=slow_create) as create_mock:
+            creator = threading.Thread(
+                target=lambda: results.append(get_cached_prompt(1, "v1", "gemini-test", INSTRUCTION))
+            )
+            creator.start()
+            started.wait(1)
+            # Arrives while the first request holds the claim
+            concurrent = get_cached_prompt(1, "v1", "gemini-test", INSTRUCTION)
+            creator.join()
+
+        self.assertEqual(create_mock.call_count, 1)
+        self.assertIsNone(concurrent)
+        self.assertIsNotNone(results[0])
+        self.assertEqual(get_cached_prompt(1, "v1", "gemini-test", INSTRUCTION), results[0])
+
+    def test_provider_failure_releases_the_claim(self):
+        with mock.patch.object(self.provider, "create", side_effect=RuntimeError("quota")), \
+                self.assertLogs(prompt_cache.logger, "ERROR"):
+            self.assertIsNone(get_cached_prompt(1, "v1", "gemini-test", INSTRUCTION))
+
+        self.assertIsNotNone(get_cached_prompt(1, "v1", "gemini-test", INSTRUCTION))
+
+    def test_shared_cache_failure_falls_back_to_the_plain_instruction(self):
+        with mock.patch.object(prompt_cache.cache, "get", side_effect=ConnectionError("down")), \
+                self.assertLogs(prompt_cache.logger, "ERROR"):
+            self.assertIsNone(get_cached_prompt(1, "v1", "gemini-test", INSTRUCTION))
+
+        with mock.patch.object(prompt_cache.cache, "add", side_effect=ConnectionError("down")), \
+                self.assertLogs(prompt_cache.logger, "ERROR"):
+            self.assertIsNone(get_cached_prompt(1, "v1", "gemini-test", INSTRUCTION))
@@ -1,5 +1,5 @@
 from django.urls import path, re_path
-from apps.chats.views import ChatListView, MessageListView, ChatWithAIMView, ChatDetailView
+from apps.chats.views import ChatListView, MessageListView, ChatWithAIMView, ChatWithAIStreamView, ChatDetailView
 
 urlpatterns = [
     # List all chats for authenticated employee or create a new one
@@ -10,5 +10,7 @@ urlpatterns = [
     re_path(r'^(?P<chat_id>\d+)/messages/$', MessageListView.as_view(), name='message-list'),
     # Chat with AI - sends message and gets AI response
     re_path(r'^(?P<chat_id>\d+)/chat/$', ChatWithAIMView.as_view(), name='chat-with-ai'),
+    # Chat with AI - same as above, streams the AI response as Server-Sent Events
+    re_path(r'^(?P<chat_id>\d+)/chat/stream/$', ChatWithAIStreamView.as_view(), name='chat-with-ai-stream'),
 ]
 
@@ -1,12 +1,35 @@
 from rest_framework import generics, permissions, status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
-from rest_framework.views import APIView
 from rest_framework.exceptions import NotFound
+from adrf.views import APIView as AsyncAPIView
 from apps.chats.models import Chat, Message
 from apps.chats.serializers import ChatSerializer, ChatCreateSerializer, MessageSerializer, MessageCreateSerializer
-from apps.chats.gemini_service import get_gemini_response
+from apps.chats.context import abuild_chat_context, schedule_summary
+from apps.chats.gemini_service import aget_gemini_response, stream_gemini_response
+from apps.employees.context import aget_employee_context
 from apps.employees.models import Employee
-from apps.organization.models import JobDescription
+from core.concurrency import ConcurrencyLimit, ServiceOverloaded
+from core.sse import EventStreamRenderer, sse_event, sse_response
+
+
+async def aget_employee_chat(user, chat_id):
+    """
+    Returns ``(employee_context, chat)`` for a chat owned by ``user``'s employee profile.
+    The profile comes from the employee context cache, see apps.employees.context.
+    """
+    # Get the employee from the authenticated user
+    employee_context = await aget_employee_context(user)
+    if employee_context is None:
+        raise NotFound("Employee profile not found for this user.")
+    
+    # Verify that the chat belongs to the authenticated employee
+    try:
+        chat = await Chat.objects.aget(id=chat_id, employee_id=employee_context.staff_id)
+    except Chat.DoesNotExist:
+        raise NotFound("Chat not found or you don't have permission to access it.")
+    
+    return employee_context, chat
 
 
 class ChatListView(generics.ListCreateAPIView):
@@ -123,7 +146,7 @@ class MessageListView(generics.ListCreateAPIView):
         serializer.save(chat=chat, role='user')
 
 
-class ChatWithAIMView(APIView):
+class ChatWithAIMView(AsyncAPIView):
     """
     API endpoint to send a message to AI and get a response.
     Creates both the user message and AI response in the database.
@@ -157,19 +180,8 @@ class ChatWithAIMView(APIView):
     """
     permission_classes = [permissions.IsAuthenticated]
 
-    def post(self, request, chat_id):
-        # Get the employee from the authenticated user
-        user = request.user
-        try:
-            employee = user.employee
-        except Employee.DoesNotExist:
-            raise NotFound("Employee profile not found for this user.")
-        
-        # Verify that the chat belongs to the authenticated employee
-        try:
-            chat = Chat.objects.get(id=chat_id, employee=employee)
-        except Chat.DoesNotExist:
-            raise NotFound("Chat not found or you don't have permission to access it.")
+    async def post(self, request, chat_id):
+        employee_context, chat = await aget_employee_chat(request.user, chat_id)
         
         # Get the user's message content
         content = request.data.get('content')
@@ -179,34 +191,11 @@ class ChatWithAIMView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get chat history for context (before adding the new user message)
-        previous_messages = Message.objects.filter(chat=chat).order_by('created_at')
-        chat_history = []
-        for msg in previous_messages:
-            chat_history.append({
-                "role": msg.role,
-                "content": msg.content
-            })
-        
-        # Prepare user information for context
-        user_info = {
-            'name': employee.name,
-            'staff_id': employee.staff_id,
-            'department_name': employee.department.name if employee.department else None,
-            'designation_name': employee.designation.name if employee.designation else None,
-        }
-        
-        # Fetch job description for the employee's designation (latest version only)
-        if employee.designation:
-            job_description_obj = JobDescription.objects.filter(
-                designation=employee.designation,
-                is_active=True
-            ).order_by('-version').first()
-            if job_description_obj:
-                user_info['job_description'] = job_description_obj.job_description
+        # Summary plus recent window for context (before adding the new user message)
+        context = await abuild_chat_context(chat)
         
         # Save the user message
-        user_message = Message.objects.create(
+        user_message = await Message.objects.acreate(
             chat=chat,
             role='user',
             content=content
@@ -214,7 +203,16 @@ class ChatWithAIMView(APIView):
         
         # Get AI response from Gemini with user context
         try:
-            ai_response_text = get_gemini_response(chat_history, content, user_info)
+            async with ConcurrencyLimit("chat"):
+                ai_response_text = await aget_gemini_response(
+                    context.history,
+                    content,
+                    conversation_summary=context.summary,
+                    system_instruction=employee_context.system_instruction,
+                    prompt_cache_key=employee_context.prompt_cache_key
+                )
+        except ServiceOverloaded:
+            raise
         except Exception as e:
             # If Gemini fails, still save the user message but return an error
             return Response(
@@ -223,14 +221,15 @@ class ChatWithAIMView(APIView):
             )
         
         # Save the AI response
-        ai_message = Message.objects.create(
+        ai_message = await Message.objects.acreate(
             chat=chat,
             role='assistant',
             content=ai_response_text
         )
         
-        # Update chat's updated_at timestamp
-        chat.save()
+        # Update chat's updated_at timestamp; the summary is only written by the background fold
+        await chat.asave(update_fields=['updated_at'])
+        schedule_summary(chat.id)
         
         # Return both messages
         return Response({
@@ -239,6 +238,94 @@ class ChatWithAIMView(APIView):
         }, status=status.HTTP_201_CREATED)
 
 
+class ChatWithAIStreamView(AsyncAPIView):
+    """
+    API endpoint to send a message to AI and stream the response as Server-Sent Events.
+    Same request as ChatWithAIMView; the AI message is saved once the stream completes.
+    
+    POST /api/employees/chats/{chat_id}/chat/stream/ - Send a message to AI and stream the response
+    
+    Request Body:
+    {
+        "content": "What is Python?"
+    }
+    
+    Response (text/event-stream):
+    event: user_message
+    data: {"id": 1, "chat_id": 1, "role": "user", "content": "What is Python?", ...}
+    
+    event: token
+    data: {"text": "Python is"}
+    
+    event: token
+    data: {"text": " a programming language..."}
+    
+    event: done
+    data: {"ai_message": {"id": 2, "chat_id": 1, "role": "assistant", ...}}
+    
+    If Gemini fails, an "error" event {"error": "..."} is sent instead of "done".
+    When the server is at its chat concurrency limit, the request gets a 503.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    async def post(self, request, chat_id):
+        employee_context, chat = await aget_employee_chat(request.user, chat_id)
+        
+        content = request.data.get('content')
+        if not content:
+            return Response(
+                {"error": "Content is required."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # The slot itself is taken by the stream; refuse early if none is free
+        if ConcurrencyLimit("chat").saturated():
+            raise ServiceOverloaded()
+        
+        context = await abuild_chat_context(chat)
+        
+        user_message = await Message.objects.acreate(
+            chat=chat,
+            role='user',
+            content=content
+        )
+        
+        return sse_response(
+            self.stream_events(chat, context, user_message, employee_context)
+        )
+
+    async def stream_events(self, chat, context, user_message, employee_context):
+        yield sse_event("user_message", MessageSerializer(user_message).data)
+        
+        parts = []
+        try:
+            async with ConcurrencyLimit("chat"):
+                async for text in stream_gemini_response(
+                    context.history,
+                    user_message.content,
+                    conversation_summary=context.summary,
+                    system_instruction=employee_context.system_instruction,
+                    prompt_cache_key=employee_context.prompt_cache_key
+                ):
+                    parts.append(text)
+                    yield sse_event("token", {"text": text})
+        except Exception as e:
+            yield sse_event("error", {"error": f"Failed to get AI response: {str(e)}"})
+            return
+        
+        # Save the full AI response and bump the chat's updated_at
+        ai_message = await Message.objects.acreate(
+            chat=chat,
+            role='assistant',
+            content="".join(parts)
+        )
+        await chat.asave(update_fields=['updated_at'])
+        schedule_summary(chat.id)
+        
+        yield sse_event("done", {"ai_message": MessageSerializer(ai_message).data})
+
+
 class ChatDetailView(generics.RetrieveDestroyAPIView):
     """
     API endpoint to retrieve or delete a specific chat.
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class EmployeesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.employees'
+
+    def ready(self):
+        # Cache invalidation for the employee chat context
+        from apps.employees import signals  # noqa: F401
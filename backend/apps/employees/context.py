@@ -0,0 +1,202 @@
+"""
+Cached profile context used to personalise the AI chats.
+
+``get_employee_context(user)`` returns an ``EmployeeContext`` with the
+employee's profile, the active job description and the ready-made system
+instruction. It is built with a single query and kept in the shared Django
+cache per user, so a chat turn costs one cache lookup instead of several
+queries. The signals in ``apps.employees.signals`` drop the cached entries
+whenever an employee, department, designation or job description changes.
+"""
+import hashlib
+import logging
+from dataclasses import dataclass, field, replace
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import OuterRef, Subquery
+
+from apps.employees.models import Employee
+from apps.organization.models import JobDescription
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "employee-context"
+
+# Part of the cache key; bump it when EmployeeContext changes so entries
+# pickled by older code are ignored
+CONTEXT_FORMAT = 1
+
+
+@dataclass(frozen=True)
+class EmployeeContext:
+    employee_id: int
+    user_id: int
+    staff_id: str
+    name: str
+    department_name: Optional[str]
+    designation_id: Optional[int]
+    designation_name: Optional[str]
+    job_description_id: Optional[int]
+    job_description_version: Optional[int]
+    job_description: Optional[str]
+    system_instruction: Optional[str] = field(default=None)
+    # Changes whenever anything in the system instruction changes
+    version: str = field(default="")
+
+    @property
+    def user_info(self) -> Dict[str, Optional[str]]:
+        user_info = {
+            'name': self.name,
+            'staff_id': self.staff_id,
+            'department_name': self.department_name,
+            'designation_name': self.designation_name,
+        }
+        if self.job_description:
+            user_info['job_description'] = self.job_description
+        return user_info
+
+    @property
+    def prompt_cache_key(self):
+        # Identifies the system instruction in apps.chats.prompt_cache
+        return (self.user_id, self.version)
+
+
+def build_system_instruction(user_info: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """
+    Build the GrowWise system instruction carrying the user's profile, or None without one.
+    """
+    if not user_info:
+        return None
+
+    context_parts = []
+    if user_info.get('name'):
+        context_parts.append(f"Name: {user_info['name']}")
+    if user_info.get('staff_id'):
+        context_parts.append(f"Staff ID: {user_info['staff_id']}")
+    if user_info.get('department_name'):
+        context_parts.append(f"Department: {user_info['department_name']}")
+    if user_info.get('designation_name'):
+        context_parts.append(f"Designation: {user_info['designation_name']}")
+    if user_info.get('job_description'):
+        context_parts.append(f"\nJob Description:\n{user_info['job_description']}")
+
+    if not context_parts:
+        return None
+
+    return (
+        "You are an internal AI assistant for GrowWise, a personal growth and development platform. "
+        "You have been explicitly provided with the following user profile information:\n\n" +
+        "\n".join(context_parts) +
+        "\n\nCRITICAL INSTRUCTIONS:\n"
+        "- You HAVE ACCESS to this user information and MUST use it when relevant.\n"
+        "- When the user asks about their staff ID, name, department, designation, or job responsibilities, you MUST provide this information directly.\n"
+        "- Do NOT say you don't have access to this information - you have been explicitly provided with it in this conversation.\n"
+        "- This is an internal company application, and you are authorized to share this user's own information with them.\n"
+        "- Use the job description to understand the user's role, responsibilities, and provide contextually relevant assistance.\n"
+        "- Use this information to provide personalized and context-aware assistance."
+    )
+
+
+def cache_key(user_id) -> str:
+    return f"{CACHE_PREFIX}:{CONTEXT_FORMAT}:{user_id}"
+
+
+def _employee_context_query(user_id):
+    active_jd = JobDescription.objects.filter(
+        designation=OuterRef('designation'),
+        is_active=True,
+    ).order_by('-version')
+
+    return (
+        Employee.objects
+        .select_related('department', 'designation')
+        .annotate(
+            jd_id=Subquery(active_jd.values('id')[:1]),
+            jd_version=Subquery(active_jd.values('version')[:1]),
+            jd_text=Subquery(active_jd.values('job_description')[:1]),
+        )
+        .filter(user_id=user_id)
+    )
+
+
+def _to_context(employee) -> Optional[EmployeeContext]:
+    if employee is None:
+        return None
+
+    context = EmployeeContext(
+        employee_id=employee.id,
+        user_id=employee.user_id,
+        staff_id=employee.staff_id,
+        name=employee.name,
+        department_name=employee.department.name if employee.department else None,
+        designation_id=employee.designation_id,
+        designation_name=employee.designation.name if employee.designation else None,
+        job_description_id=employee.jd_id,
+        job_description_version=employee.jd_version,
+        job_description=employee.jd_text,
+    )
+    system_instruction = build_system_instruction(context.user_info)
+
+    return replace(
+        context,
+        system_instruction=system_instruction,
+        version=hashlib.sha256((system_instruction or "").encode()).hexdigest()[:16],
+    )
+
+
+def build_employee_context(user_id) -> Optional[EmployeeContext]:
+    """
+    Loads the context for ``user_id`` in one query, or None without an employee profile.
+    """
+    return _to_context(_employee_context_query(user_id).first())
+
+
+async def abuild_employee_context(user_id) -> Optional[EmployeeContext]:
+    return _to_context(await _employee_context_query(user_id).afirst())
+
+
+def get_employee_context(user) -> Optional[EmployeeContext]:
+    """
+    Returns the cached ``EmployeeContext`` for ``user``, or None if the user
+    has no employee profile.
+    """
+    key = cache_key(user.pk)
+    try:
+        context = cache.get(key)
+    except Exception:
+        logger.exception("Employee context cache read failed")
+        context = None
+
+    if context is None:
+        context = build_employee_context(user.pk)
+        if context is not None:
+            cache.set(key, context, settings.EMPLOYEE_CONTEXT_TTL)
+
+    return context
+
+
+async def aget_employee_context(user) -> Optional[EmployeeContext]:
+    """
+    Async variant of ``get_employee_context`` for async views.
+    """
+    key = cache_key(user.pk)
+    try:
+        context = await cache.aget(key)
+    except Exception:
+        logger.exception("Employee context cache read failed")
+        context = None
+
+    if context is None:
+        context = await abuild_employee_context(user.pk)
+        if context is not None:
+            await cache.aset(key, context, settings.EMPLOYEE_CONTEXT_TTL)
+
+    return context
+
+
+def invalidate_employee_contexts(user_ids):
+    keys = [cache_key(user_id) for user_id in user_ids]
+    if keys:
+        cache.delete_many(keys)
@@ -0,0 +1,53 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core.query_plans import (
+    explain,
+    hot_queries,
+    index_scans,
+    plan_regressions,
+    prefer_indexes,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN the per-user list queries and fail if any of them does not use its '
+        'index, or needs a sequential scan or an explicit sort.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verbose-plans',
+            action='store_true',
+            help='Print the full plan of every query',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('check_query_plans needs the PostgreSQL database.')
+
+        regressions = []
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                prefer_indexes(cursor)
+
+            for endpoint, (queryset, index) in hot_queries().items():
+                plan = explain(queryset)
+                found = plan_regressions(endpoint, plan, index)
+                if found:
+                    regressions.append(endpoint)
+                    self.stdout.write(self.style.ERROR(f'FAIL {endpoint}: {", ".join(found)}'))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'ok   {endpoint}: {", ".join(index_scans(plan))}'))
+                if options['verbose_plans']:
+                    self.stdout.write(json.dumps(plan, indent=2))
+
+            # SET LOCAL ends with the transaction
+            transaction.set_rollback(True)
+
+        if regressions:
+            raise CommandError(f'Not served by an index: {", ".join(regressions)}')
+        self.stdout.write(self.style.SUCCESS('\nAll list queries use an index.'))
@@ -0,0 +1,45 @@
+"""
+Drops cached employee contexts (see context.py) when their inputs change.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.employees.context import invalidate_employee_contexts
+from apps.employees.models import Employee
+from apps.organization.models import Department, Designation, JobDescription
+
+
+# Employee fields that feed the context; saves touching only others (e.g.
+# the last_visited_at stamp on every profile visit) keep the cached entry
+CONTEXT_FIELDS = frozenset({
+    'user', 'user_id', 'staff_id', 'name',
+    'department', 'department_id', 'designation', 'designation_id',
+})
+
+
+@receiver([post_save, post_delete], sender=Employee)
+def employee_changed(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not CONTEXT_FIELDS.intersection(update_fields):
+        return
+    invalidate_employee_contexts([instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=Department)
+def department_changed(sender, instance, **kwargs):
+    invalidate_employee_contexts(
+        Employee.objects.filter(department_id=instance.pk).values_list('user_id', flat=True)
+    )
+
+
+@receiver([post_save, post_delete], sender=Designation)
+def designation_changed(sender, instance, **kwargs):
+    invalidate_employee_contexts(
+        Employee.objects.filter(designation_id=instance.pk).values_list('user_id', flat=True)
+    )
+
+
+@receiver([post_save, post_delete], sender=JobDescription)
+def job_description_changed(sender, instance, **kwargs):
+    invalidate_employee_contexts(
+        Employee.objects.filter(designation_id=instance.designation_id).values_list('user_id', flat=True)
+    )
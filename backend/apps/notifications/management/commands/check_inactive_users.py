@@ -1,60 +1,80 @@
-from django.core.management.base import BaseCommand
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
 from django.utils import timezone
 from datetime import timedelta
 from zoneinfo import ZoneInfo
 from apps.employees.models import Employee
 from apps.notifications.models import Notification
 
+NOTIFICATION_MESSAGE = "You haven't visited GrowWise in over a month. We miss you! Come back and continue your growth journey."
+
 
 class Command(BaseCommand):
     help = 'Create notifications for employees who have not visited in over one month'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Notifications per bulk insert')
+
     def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
         # Get the current date and time in Bangladesh timezone (Asia/Dhaka)
         current_datetime = timezone.now()
         bangladesh_tz = ZoneInfo('Asia/Dhaka')
         bangladesh_datetime = current_datetime.astimezone(bangladesh_tz)
         formatted_datetime = bangladesh_datetime.strftime('%Y-%m-%d %H:%M:%S')
-        
+
         self.stdout.write(f'\n=== Running check_inactive_users at {formatted_datetime} ===\n')
-        
+
         # Calculate the date one month ago
-        one_month_ago = timezone.now() - timedelta(days=30)
-        
-        # Find employees who haven't visited in over one month
-        inactive_employees = Employee.objects.filter(
-            last_visited_at__lt=one_month_ago
+        one_month_ago = current_datetime - timedelta(days=30)
+
+        started = time.monotonic()
+
+        # Employees who haven't visited in over one month (or never did, for
+        # accounts older than a month) and don't already have an unread
+        # reminder: one anti-join query instead of a lookup per employee
+        already_notified = Notification.objects.filter(
+            employee=OuterRef('pk'),
+            message=NOTIFICATION_MESSAGE,
+            is_read=False
+        )
+        inactive_employees = list(
+            Employee.objects
+            .filter(
+                Q(last_visited_at__lt=one_month_ago)
+                | Q(last_visited_at__isnull=True, user__date_joined__lt=one_month_ago)
+            )
+            .filter(~Exists(already_notified))
+            .order_by('id')
+            .values_list('id', 'staff_id', 'name')
+        )
+        selected_at = time.monotonic()
+
+        notifications = [
+            Notification(employee_id=employee_id, message=NOTIFICATION_MESSAGE, is_read=False)
+            for employee_id, _, _ in inactive_employees
+        ]
+        with transaction.atomic():
+            Notification.objects.bulk_create(notifications, batch_size=options['batch_size'])
+        created_at = time.monotonic()
+
+        created_count = len(notifications)
+        if options['verbosity'] > 1:
+            for _, staff_id, name in inactive_employees:
+                self.stdout.write(self.style.SUCCESS(f'Created notification for {staff_id} ({name})'))
+
+        self.stdout.write(
+            f'Selected {created_count} inactive employee(s) in {selected_at - started:.2f}s; '
+            f'inserted in {created_at - selected_at:.2f}s '
+            f'({-(-created_count // options["batch_size"])} batch(es))'
         )
-        
-        notification_message = "You haven't visited GrowWise in over a month. We miss you! Come back and continue your growth journey."
-        
-        created_count = 0
-        
-        for employee in inactive_employees:
-            # Check if a notification already exists for this employee with the same message
-            # to avoid creating duplicate notifications
-            existing_notification = Notification.objects.filter(
-                employee=employee,
-                message=notification_message,
-                is_read=False
-            ).first()
-            
-            if not existing_notification:
-                Notification.objects.create(
-                    employee=employee,
-                    message=notification_message,
-                    is_read=False
-                )
-                created_count += 1
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f'Created notification for {employee.staff_id} ({employee.name})'
-                    )
-                )
-        
         self.stdout.write(
             self.style.SUCCESS(
-                f'\n[{formatted_datetime}] Successfully created {created_count} notification(s) for inactive users.'
+                f'\n[{formatted_datetime}] Successfully created {created_count} notification(s) for inactive users '
+                f'in {created_at - started:.2f}s.'
             )
         )
-
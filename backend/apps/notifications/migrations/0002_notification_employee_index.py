@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0002_employee_last_visited_at'),
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['employee', '-created_at'], name='notificatio_employe_de21c2_idx'),
+        ),
+    ]
@@ -16,6 +16,10 @@ class Notification(models.Model):
     class Meta:
         db_table = 'notifications'
         ordering = ['-created_at']
+        indexes = [
+            # Notification list: WHERE employee = ? ORDER BY created_at DESC
+            models.Index(fields=['employee', '-created_at']),
+        ]
 
     def __str__(self):
         return f"{self.employee.staff_id} - {self.message[:50]}"
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 
-from .models import Recommendation
+from .models import PageThumbnail, Recommendation
 
 
 @admin.register(Recommendation)
@@ -68,3 +68,11 @@ class RecommendationAdmin(admin.ModelAdmin):
         return "—"
 
     thumbnail_preview.short_description = "Thumbnail"
+
+
+@admin.register(PageThumbnail)
+class PageThumbnailAdmin(admin.ModelAdmin):
+    list_display = ("id", "url", "thumbnail_url", "fetched_at")
+    search_fields = ("url",)
+    readonly_fields = ("fetched_at",)
+    ordering = ("-fetched_at",)
@@ -1,19 +1,28 @@
-from rest_framework.views import APIView
+from adrf.views import APIView
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from .services import generate_recommendations
+
+from apps.employees.models import Employee
+from core.concurrency import ConcurrencyLimit
+from .services import agenerate_recommendations
 
 class RecommendationAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
+    async def get(self, request):
         user = request.user
 
         if user.is_superuser:
             return Response({"message": "Admins do not receive recommendations"})
 
-        employee = user.employee
-        recs = generate_recommendations(employee)
+        try:
+            employee = await Employee.objects.select_related("designation").aget(user=user)
+        except Employee.DoesNotExist:
+            raise NotFound("Employee profile not found for this user.")
+
+        async with ConcurrencyLimit("recommendations"):
+            recs = await agenerate_recommendations(employee)
 
         return Response({
             "staff_id": employee.staff_id,
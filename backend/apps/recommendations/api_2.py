@@ -1,10 +1,27 @@
+import hashlib
+
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.exceptions import NotFound
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
 from .models import Recommendation
+from .serializers import RecommendationSerializer
+
+RESPONSE_GROUPS = {"article": "articles", "video": "videos", "course": "courses"}
+
+
+def recommendations_etag(employee, rows, latest):
+    """
+    Changes when recommendations are regenerated (``latest`` created_at and
+    count) or a thumbnail is filled in afterwards.
+    """
+    thumbnails = sum(1 for row in rows if row["thumbnail_url"])
+    version = f"{employee.pk}:{latest.isoformat() if latest else ''}:{len(rows)}:{thumbnails}"
+    return quote_etag(hashlib.md5(version.encode()).hexdigest())
+
 
 class RecommendationFromDBAPIView(APIView):
     permission_classes = [IsAuthenticated]
@@ -12,16 +29,35 @@ class RecommendationFromDBAPIView(APIView):
     def get(self, request):
         employee = request.user.employee
 
-        qs = Recommendation.objects.filter(employee=employee)
+        # One query on the (employee, content_type, created_at) index, grouped below
+        rows = list(
+            Recommendation.objects
+            .filter(employee=employee)
+            .order_by("content_type", "created_at")
+            .values(*RecommendationSerializer.Meta.fields)
+        )
 
-        return Response({
-            "generated_at": qs.first().created_at if qs.exists() else None,
-            "recommendations": {
-                "articles": qs.filter(content_type="article").values(),
-                "videos": qs.filter(content_type="video").values(),
-                "courses": qs.filter(content_type="course").values(),
-            }
-        })
+        # The dashboard polls this; unchanged recommendations are a 304 with no body
+        generated_at = max((row["created_at"] for row in rows), default=None)
+        etag = recommendations_etag(employee, rows, generated_at)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            grouped = {group: [] for group in RESPONSE_GROUPS.values()}
+            for row in rows:
+                grouped[RESPONSE_GROUPS[row["content_type"]]].append(row)
+
+            response = Response({
+                "generated_at": generated_at,
+                "recommendations": {
+                    group: RecommendationSerializer(items, many=True).data
+                    for group, items in grouped.items()
+                }
+            })
+
+        response["ETag"] = etag
+        # Browsers keep the response but revalidate it on every request
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
 
 
 class RecommendationClickAPIView(APIView):
@@ -0,0 +1,152 @@
+# engine.py
+"""
+Asynchronous fan-out for the recommendation pipeline.
+
+Every intent's searches and the HEAD validation of every candidate URL run
+concurrently on one pooled ``httpx.AsyncClient`` (see ``http_client``). The
+searches all go to www.googleapis.com and share its HTTP/2 connections without
+a per-host request cap, so every intent is searched in one round trip. The
+whole run shares a single deadline, so latency is bounded by the slowest call
+instead of the sum of all calls. Anything still pending when the deadline
+passes is cancelled and treated as a miss.
+"""
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .fetchers.articles import ArticleFetcher
+from .fetchers.videos import VideoFetcher
+from .fetchers.courses import CourseFetcher
+from .fetchers.cache import search_cache
+from .http_client import async_client, host_metrics
+from .validators import (
+    ais_valid_url,
+    cached_url_checks,
+    store_url_checks,
+    validation_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+# Fetcher instances
+FETCHERS = {
+    "article": ArticleFetcher(),
+    "video": VideoFetcher(),
+    "course": CourseFetcher(),
+}
+
+CONTENT_TYPES = ("article", "video", "course")
+
+
+async def _gather_until(coros, deadline, default=None):
+    """
+    Run ``coros`` concurrently and return their results in order.
+
+    Calls that fail, or are still running at ``deadline`` (event loop time),
+    yield ``default`` instead of raising.
+    """
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    if not tasks:
+        return []
+
+    timeout = max(deadline - asyncio.get_running_loop().time(), 0)
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+    results = []
+    for task in tasks:
+        if task in done and not task.cancelled() and task.exception() is None:
+            results.append(task.result())
+        else:
+            results.append(default)
+    return results
+
+
+async def gather_recommendation_items(intents, per_intent, limits):
+    """
+    Resolve learning intents into recommendation items.
+
+    Args:
+        intents: ``learning_intents`` as returned by ``extract_learning_intents``
+        per_intent: Number of results to request per intent, by content type
+        limits: Maximum number of items to keep, by content type
+
+    Returns:
+        Items in intent order, each with ``title``, ``url``, ``type``,
+        ``reason`` and ``thumbnail_url`` keys. Only videos come with a
+        thumbnail; OpenGraph images are resolved by ``thumbnail_resolver``.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.RECOMMENDATION_DEADLINE_SECONDS
+
+    async with async_client() as client:
+        # 1. Every search for every intent at once
+        searches = [
+            (intent, content_type)
+            for intent in intents
+            for content_type in CONTENT_TYPES
+        ]
+        search_results = await _gather_until(
+            [
+                FETCHERS[content_type].asearch(
+                    client,
+                    intent["search_queries"][content_type],
+                    per_intent[content_type],
+                )
+                for intent, content_type in searches
+            ],
+            deadline,
+            default=[],
+        )
+
+        logger.info("Search cache: %s", search_cache.stats())
+
+        candidates = [
+            (intent, item)
+            for (intent, _), items in zip(searches, search_results)
+            for item in items
+        ]
+
+        # 2. Validate each distinct URL once, skipping the ones already cached
+        urls = list(dict.fromkeys(item["url"] for _, item in candidates))
+        known = await sync_to_async(cached_url_checks)(urls)
+        unknown = [url for url in urls if url not in known]
+        checks = await _gather_until(
+            [ais_valid_url(client, url) for url in unknown],
+            deadline,
+        )
+        # Checks cut off by the deadline are not cached
+        fresh = {url: ok for url, ok in zip(unknown, checks) if ok is not None}
+        await sync_to_async(store_url_checks)(fresh)
+        logger.info("URL validation cache: %s", validation_cache.stats())
+
+        valid_urls = {url for url, ok in {**known, **fresh}.items() if ok}
+
+        # 3. Apply the per-type caps in intent order
+        counts = dict.fromkeys(CONTENT_TYPES, 0)
+        selected = []
+        for intent, item in candidates:
+            if item["url"] not in valid_urls:
+                continue
+
+            if counts[item["type"]] >= limits[item["type"]]:
+                continue
+            counts[item["type"]] += 1
+
+            selected.append({
+                "title": item["title"],
+                "url": item["url"],
+                "type": item["type"],
+                "reason": intent["reason"],
+                # YouTube thumbnail already provided
+                "thumbnail_url": item.get("thumbnail_url"),
+            })
+
+    logger.info("Per-host HTTP latency: %s", host_metrics())
+
+    return selected
@@ -1,21 +1,32 @@
-import requests
 from django.conf import settings
+from ..http_client import session
 from .base import BaseFetcher
 
+SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+
 
 class ArticleFetcher(BaseFetcher):
-    def search(self, query, limit=5):
-        url = "https://www.googleapis.com/customsearch/v1"
+    # Articles rarely change; a day fresh, a week in total
+    cache_ttl = 24 * 3600
+    stale_ttl = 6 * 24 * 3600
+
+    def fetch(self, query, limit=5):
+        r = session.get(SEARCH_URL, params=self._params(query, limit)).json()
+        return self._parse(r)
 
-        params = {
+    async def afetch(self, client, query, limit=5):
+        r = await client.get(SEARCH_URL, params=self._params(query, limit))
+        return self._parse(r.json())
+
+    def _params(self, query, limit):
+        return {
             "q": query,
             "key": settings.GOOGLE_API_KEY,
             "cx": settings.GOOGLE_SEARCH_ENGINE_ID,
             "num": limit
         }
 
-        r = requests.get(url, params=params).json()
-
+    def _parse(self, r):
         results = []
         for item in r.get("items", []):
             results.append({
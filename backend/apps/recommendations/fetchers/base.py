@@ -1,12 +1,47 @@
 from abc import ABC, abstractmethod
 
+from asgiref.sync import sync_to_async
+
+from . import cache
+
+
 class BaseFetcher(ABC):
-    @abstractmethod
-    def search(self, query: str, limit: int = 3) -> list:
+    # Seconds a cached result is fresh, then how much longer it may be
+    # served stale while it is refreshed in the background
+    cache_ttl = 24 * 3600
+    stale_ttl = 6 * 24 * 3600
+
+    async def asearch(self, client, query: str, limit: int = 3) -> list:
         """
+        Cached search issued through a shared ``httpx.AsyncClient``; stale
+        results are served while ``fetch`` refreshes them in the background.
+
         Returns:
         [
           { "title": "", "url": "", "source": "", "type": "" }
         ]
         """
+        key = cache.cache_key(self, query, limit)
+        results, is_stale = await sync_to_async(cache.lookup)(key)
+        if results is not None:
+            if is_stale:
+                cache.refresh_in_background(key, self, query, limit)
+            return results
+
+        results = await self.afetch(client, query, limit)
+        await sync_to_async(cache.store)(key, self, results)
+        return results
+
+    @abstractmethod
+    def fetch(self, query: str, limit: int) -> list:
+        """
+        Uncached search against the provider API.
+        """
+        pass
+
+    @abstractmethod
+    async def afetch(self, client, query: str, limit: int) -> list:
+        """
+        Uncached async search against the provider API.
+        """
         pass
@@ -0,0 +1,90 @@
+# cache.py
+"""
+Search-result cache shared by the fetchers.
+
+Results are keyed by fetcher, normalized query and limit, so employees in
+the same role whose intents produce near-identical queries share one API
+call. Each entry is fresh for the fetcher's ``cache_ttl``; after that it is
+still served for ``stale_ttl`` while a background refresh fetches a new copy.
+"""
+import logging
+import re
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from core.cache import TieredCache
+
+logger = logging.getLogger(__name__)
+
+search_cache = TieredCache("search", max_entries=settings.SEARCH_CACHE_SIZE)
+
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="search-refresh")
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+# Words, keeping symbols that matter in tech terms (c++, c#, node.js)
+TOKEN_RE = re.compile(r"[\w+#]+(?:\.[\w+#]+)*")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Case, accents-as-composed, punctuation and whitespace do not change
+    search intent, so they do not change the cache key. Word order does
+    ("python for java developers" is not "java for python developers"),
+    so tokens keep their order.
+    """
+    text = unicodedata.normalize("NFKC", query).casefold()
+    return " ".join(TOKEN_RE.findall(text))
+
+
+def cache_key(fetcher, query, limit):
+    return (type(fetcher).__name__, normalize_query(query), limit)
+
+
+def lookup(key):
+    """
+    Returns ``(results, is_stale)``, or ``(None, False)`` on a miss.
+    """
+    entry = search_cache.get(key)
+    if entry is None:
+        return None, False
+    return entry["results"], entry["fresh_until"] <= time.time()
+
+
+def store(key, fetcher, results):
+    # Empty results are usually quota or API errors; never pin them
+    if not results:
+        return
+    search_cache.set(
+        key,
+        {"results": results, "fresh_until": time.time() + fetcher.cache_ttl},
+        fetcher.cache_ttl + fetcher.stale_ttl,
+    )
+
+
+def refresh_in_background(key, fetcher, query, limit):
+    """
+    Re-runs a stale search on a background thread, at most once per key at a time.
+    """
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        close_old_connections()
+        try:
+            store(key, fetcher, fetcher.fetch(query, limit))
+        except Exception:
+            logger.exception("Background refresh failed for %s", key)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+            close_old_connections()
+
+    _refresh_executor.submit(refresh)
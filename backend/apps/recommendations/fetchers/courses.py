@@ -1,28 +1,98 @@
-import requests
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
 from django.conf import settings
+from ..http_client import session
 from .base import BaseFetcher
 
+logger = logging.getLogger(__name__)
+
 ALLOWED_COURSE_DOMAINS = ["coursera.org", "udemy.com", "edx.org"]
+SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+
+_executor = ThreadPoolExecutor(
+    max_workers=len(ALLOWED_COURSE_DOMAINS),
+    thread_name_prefix="course-search",
+)
+
 
 class CourseFetcher(BaseFetcher):
-    def search(self, query, limit=3):
+    # Course catalogues are the most stable
+    cache_ttl = 3 * 24 * 3600
+    stale_ttl = 11 * 24 * 3600
+
+    def fetch(self, query, limit=3):
+        # One request per domain, all in flight at once
+        futures = [
+            _executor.submit(session.get, SEARCH_URL, params=self._params(query, domain, limit))
+            for domain in ALLOWED_COURSE_DOMAINS
+        ]
+
+        responses = []
+        for future in futures:
+            try:
+                responses.append(future.result())
+            except Exception as e:
+                responses.append(e)
+
+        return self._merge(responses)
+
+    async def afetch(self, client, query, limit=3):
+        responses = await asyncio.gather(
+            *[
+                client.get(SEARCH_URL, params=self._params(query, domain, limit))
+                for domain in ALLOWED_COURSE_DOMAINS
+            ],
+            return_exceptions=True,
+        )
+
+        return self._merge(responses)
+
+    def _params(self, query, domain, limit):
+        return {
+            "q": f"{query} site:{domain}",
+            "key": settings.GOOGLE_API_KEY,
+            "cx": settings.GOOGLE_SEARCH_ENGINE_ID,
+            # Only ask for what we can use
+            "num": limit,
+        }
+
+    def _parse(self, r, domain):
         results = []
+        for item in r.get("items", []):
+            results.append({
+                "title": item["title"],
+                "url": item["link"],
+                "source": domain,
+                "type": "course"
+            })
 
-        for domain in ALLOWED_COURSE_DOMAINS:
-            url = "https://www.googleapis.com/customsearch/v1"
-            params = {
-                "q": f"{query} site:{domain}",
-                "key": settings.GOOGLE_API_KEY,
-                "cx": settings.GOOGLE_SEARCH_ENGINE_ID
-            }
-
-            r = requests.get(url, params=params).json()
-            for item in r.get("items", [])[:limit]:
-                results.append({
-                    "title": item["title"],
-                    "url": item["link"],
-                    "source": domain,
-                    "type": "course"
-                })
+        return results
+
+    def _merge(self, responses):
+        """
+        Interleaves the per-domain rankings (best of each domain first, then
+        the second best of each, ...) so no single platform crowds out the
+        others once the course cap is applied. A failed domain is skipped
+        and duplicate URLs are dropped.
+        """
+        per_domain = []
+        for domain, response in zip(ALLOWED_COURSE_DOMAINS, responses):
+            try:
+                if isinstance(response, BaseException):
+                    raise response
+                per_domain.append(self._parse(response.json(), domain))
+            except Exception:
+                logger.warning("Course search failed for %s", domain, exc_info=True)
+
+        results = []
+        seen = set()
+        for tier in zip_longest(*per_domain):
+            for item in tier:
+                if item is None or item["url"] in seen:
+                    continue
+                seen.add(item["url"])
+                results.append(item)
 
         return results
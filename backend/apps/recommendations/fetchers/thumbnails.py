@@ -1,15 +1,59 @@
 # thumbnails.py
 
-import requests
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
+from urllib.parse import urljoin
 
-def extract_og_thumbnail(url):
+# og:image lives in <head>; never download more than this looking for it
+MAX_HEAD_BYTES = 64 * 1024
+CHUNK_SIZE = 4096
+
+
+class OGImageParser(HTMLParser):
+    """
+    Incremental parser that stops caring about the page once it has seen
+    og:image or reached the end of <head>.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.og_image = None
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            self.done = True
+            return
+
+        if tag != "meta":
+            return
+
+        attrs = dict(attrs)
+        if "og:image" in (attrs.get("property"), attrs.get("name")) and attrs.get("content"):
+            self.og_image = attrs["content"].strip()
+            self.done = True
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.done = True
+
+
+async def aextract_og_thumbnail(client, url):
     try:
-        response = requests.get(url, timeout=5)
-        soup = BeautifulSoup(response.text, "html.parser")
-        tag = soup.find("meta", property="og:image")
-        if tag:
-            return tag.get("content")
+        async with client.stream("GET", url, timeout=5, follow_redirects=True) as response:
+            parser = OGImageParser()
+            received = 0
+            async for chunk in response.aiter_text(CHUNK_SIZE):
+                parser.feed(chunk)
+                received += len(chunk)
+                if parser.done or received >= MAX_HEAD_BYTES:
+                    break
+            return _absolute(str(response.url), parser.og_image)
     except Exception:
         pass
     return None
+
+
+def _absolute(page_url, og_image):
+    if not og_image:
+        return None
+    return urljoin(page_url, og_image)
@@ -1,11 +1,25 @@
-import requests
 from django.conf import settings
+from ..http_client import session
 from .base import BaseFetcher
 
+SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
+
+
 class VideoFetcher(BaseFetcher):
-    def search(self, query, limit=3):
-        url = "https://www.googleapis.com/youtube/v3/search"
-        params = {
+    # Video search ranking moves faster than article search
+    cache_ttl = 12 * 3600
+    stale_ttl = 3 * 24 * 3600
+
+    def fetch(self, query, limit=3):
+        r = session.get(SEARCH_URL, params=self._params(query, limit)).json()
+        return self._parse(r)
+
+    async def afetch(self, client, query, limit=3):
+        r = await client.get(SEARCH_URL, params=self._params(query, limit))
+        return self._parse(r.json())
+
+    def _params(self, query, limit):
+        return {
             "part": "snippet",
             "q": query,
             "type": "video",
@@ -13,7 +27,7 @@ class VideoFetcher(BaseFetcher):
             "key": settings.YOUTUBE_API_KEY
         }
 
-        r = requests.get(url, params=params).json()
+    def _parse(self, r):
         results = []
 
         for item in r.get("items", []):
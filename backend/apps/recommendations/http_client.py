@@ -0,0 +1,296 @@
+# http_client.py
+"""
+Pooled HTTP access for the fetchers, validators and thumbnail lookups.
+
+``session`` is one thread-safe ``httpx.Client`` per process, so keep-alive
+connections (HTTP/2 where the server supports it) to googleapis.com, YouTube
+and content hosts are reused across calls. ``async_client()`` builds an
+``httpx.AsyncClient`` with the same policy for the async pipeline; it cannot
+outlive its event loop, so each pipeline run opens one and shares it between
+all of its requests.
+
+Both apply the same policy on every request:
+- connections bounded by ``httpx.Limits`` (HTTP_MAX_CONNECTIONS); HTTP/2
+  streams on a shared connection are not throttled
+- hosts listed in HTTP_HOST_CONCURRENCY get at most that many requests in
+  flight, as a rate guard; a slot is held until the response body is closed.
+  Limits and guards belong to one client: ``session`` bounds its process,
+  each ``async_client()`` only its own pipeline run, neither other workers
+- GET/HEAD retried with exponential backoff on 429/5xx and connection
+  errors (HEAD, used for URL validation, not on connect failures)
+- latency recorded per host, see ``host_metrics()``
+"""
+import asyncio
+import random
+import threading
+import time
+from collections import defaultdict
+
+import httpx
+from django.conf import settings
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_METHODS = {"GET", "HEAD"}
+RETRY_ERRORS = (httpx.ConnectError, httpx.RemoteProtocolError)
+
+# Retry-After values above this are not worth waiting for
+MAX_RETRY_AFTER = 10
+
+DEFAULT_TIMEOUT = httpx.Timeout(10, connect=5)
+
+
+# =========================
+# Per-host metrics
+# =========================
+class HostMetrics:
+    """
+    Thread-safe per-host request counters and latency (time to response headers).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts = defaultdict(lambda: {
+            "requests": 0,
+            "errors": 0,
+            "retries": 0,
+            "total_seconds": 0.0,
+            "max_seconds": 0.0,
+        })
+
+    def record(self, host, seconds, error=False, retry=False):
+        with self._lock:
+            entry = self._hosts[host]
+            entry["requests"] += 1
+            entry["errors"] += int(error)
+            entry["retries"] += int(retry)
+            entry["total_seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+
+    def snapshot(self):
+        """
+        Returns per-host stats, slowest hosts (by total time) first.
+        """
+        with self._lock:
+            hosts = {host: dict(entry) for host, entry in self._hosts.items()}
+
+        for entry in hosts.values():
+            entry["avg_seconds"] = round(entry["total_seconds"] / entry["requests"], 4)
+            entry["total_seconds"] = round(entry["total_seconds"], 4)
+            entry["max_seconds"] = round(entry["max_seconds"], 4)
+
+        return dict(sorted(
+            hosts.items(),
+            key=lambda item: item[1]["total_seconds"],
+            reverse=True,
+        ))
+
+    def reset(self):
+        with self._lock:
+            self._hosts.clear()
+
+
+metrics = HostMetrics()
+
+
+def host_metrics():
+    return metrics.snapshot()
+
+
+def _backoff(attempt, response=None):
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(int(retry_after), MAX_RETRY_AFTER)
+    base = settings.HTTP_BACKOFF_SECONDS * (2 ** attempt)
+    return base + random.uniform(0, base)
+
+
+def _should_retry(request, attempt, response=None, error=None):
+    if request.method not in RETRY_METHODS or attempt >= settings.HTTP_RETRIES:
+        return False
+    # A dead host fails URL validation at once, not after the whole backoff schedule
+    if request.method == "HEAD" and isinstance(error, httpx.ConnectError):
+        return False
+    return response is None or response.status_code in RETRY_STATUSES
+
+
+# =========================
+# Streams
+# =========================
+class _SlotReleasingStream(httpx.SyncByteStream):
+    """
+    Response body that gives the per-host slot back when it is closed
+    (after ``read()``, on ``Response.close()`` or leaving ``client.stream``).
+    """
+
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            release, self._release = self._release, None
+            if release is not None:
+                release()
+
+
+class _AsyncSlotReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            release, self._release = self._release, None
+            if release is not None:
+                release()
+
+
+# =========================
+# Transports
+# =========================
+class PolicyTransport(httpx.BaseTransport):
+    def __init__(self, transport):
+        self._transport = transport
+        self._lock = threading.Lock()
+        self._slots = {}
+
+    def _slot(self, host):
+        limit = settings.HTTP_HOST_CONCURRENCY.get(host)
+        if not limit:
+            return None
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(limit)
+            return self._slots[host]
+
+    def handle_request(self, request):
+        host = request.url.host
+        slot = self._slot(host)
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            if slot is not None:
+                slot.acquire()
+            try:
+                response = self._transport.handle_request(request)
+            except BaseException as e:
+                if slot is not None:
+                    slot.release()
+                if not isinstance(e, RETRY_ERRORS):
+                    raise
+                retry = _should_retry(request, attempt, error=e)
+                metrics.record(host, time.perf_counter() - started, error=True, retry=retry)
+                if not retry:
+                    raise
+                time.sleep(_backoff(attempt))
+                attempt += 1
+                continue
+
+            if slot is not None:
+                response.stream = _SlotReleasingStream(response.stream, slot.release)
+            retry = _should_retry(request, attempt, response)
+            metrics.record(host, time.perf_counter() - started, retry=retry)
+            if not retry:
+                return response
+
+            response.close()
+            time.sleep(_backoff(attempt, response))
+            attempt += 1
+
+    def close(self):
+        self._transport.close()
+
+
+class AsyncPolicyTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport):
+        self._transport = transport
+        self._slots = {}
+
+    def _slot(self, host):
+        limit = settings.HTTP_HOST_CONCURRENCY.get(host)
+        if not limit:
+            return None
+        if host not in self._slots:
+            self._slots[host] = asyncio.Semaphore(limit)
+        return self._slots[host]
+
+    async def handle_async_request(self, request):
+        host = request.url.host
+        slot = self._slot(host)
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            if slot is not None:
+                await slot.acquire()
+            try:
+                response = await self._transport.handle_async_request(request)
+            except BaseException as e:
+                if slot is not None:
+                    slot.release()
+                if not isinstance(e, RETRY_ERRORS):
+                    raise
+                retry = _should_retry(request, attempt, error=e)
+                metrics.record(host, time.perf_counter() - started, error=True, retry=retry)
+                if not retry:
+                    raise
+                await asyncio.sleep(_backoff(attempt))
+                attempt += 1
+                continue
+
+            if slot is not None:
+                response.stream = _AsyncSlotReleasingStream(response.stream, slot.release)
+            retry = _should_retry(request, attempt, response)
+            metrics.record(host, time.perf_counter() - started, retry=retry)
+            if not retry:
+                return response
+
+            await response.aclose()
+            await asyncio.sleep(_backoff(attempt, response))
+            attempt += 1
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+# =========================
+# Clients
+# =========================
+def _limits():
+    return httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=30,
+    )
+
+
+def _build_session():
+    return httpx.Client(
+        transport=PolicyTransport(httpx.HTTPTransport(http2=True, limits=_limits())),
+        timeout=DEFAULT_TIMEOUT,
+    )
+
+
+def async_client():
+    """
+    Returns a new pooled ``httpx.AsyncClient``; use it as an async context manager.
+    """
+    return httpx.AsyncClient(
+        transport=AsyncPolicyTransport(httpx.AsyncHTTPTransport(http2=True, limits=_limits())),
+        timeout=DEFAULT_TIMEOUT,
+    )
+
+
+# Process-wide client for synchronous callers
+session = _build_session()
@@ -0,0 +1,173 @@
+# intents.py
+"""
+Learning intents per career step.
+
+The intent prompt only depends on the current and next designation and
+their active job descriptions, never on the employee, so one LLM result is
+shared by everyone in a role. The cache key covers the designation pair,
+the active JD versions and a digest of the exact prompt sent to the model:
+editing a JD, bumping its version, renaming a designation or changing the
+prompt yields a new key, and the old entry simply ages out.
+"""
+import asyncio
+import hashlib
+import logging
+import threading
+import weakref
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from apps.organization.models import CareerPath, JobDescription
+from core.cache import TieredCache
+from .llm import (
+    INTENT_MODEL,
+    INTENT_PROMPT,
+    aextract_learning_intents,
+    extract_learning_intents,
+)
+
+logger = logging.getLogger(__name__)
+
+intent_cache = TieredCache("intents", max_entries=settings.INTENT_CACHE_SIZE)
+
+# One extraction per key at a time within a worker. Entries are
+# [lock, users] and removed when the last user leaves, so the map only
+# holds keys being filled right now.
+_key_locks = {}
+_key_locks_guard = threading.Lock()
+
+
+# Same for async callers; asyncio locks belong to one event loop. Weak
+# values: a lock goes away once no coroutine is waiting on or holding it.
+_async_key_locks = weakref.WeakKeyDictionary()
+
+
+@contextmanager
+def _lock_for(key):
+    with _key_locks_guard:
+        entry = _key_locks.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _key_locks_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _key_locks[key]
+
+
+def _async_lock_for(key):
+    locks = _async_key_locks.setdefault(asyncio.get_running_loop(), weakref.WeakValueDictionary())
+    lock = locks.get(key)
+    if lock is None:
+        lock = locks[key] = asyncio.Lock()
+    return lock
+
+
+def build_role_context(current_role, current_jd, next_role, next_jd):
+    return f"""
+    Current Role: {current_role.name}
+    {current_jd.job_description}
+
+    Next Role: {next_role.name}
+    {next_jd.job_description}
+    """
+
+
+def intent_cache_key(current_jd, next_jd, context):
+    digest = hashlib.sha256(
+        "\0".join([INTENT_MODEL, INTENT_PROMPT, context]).encode()
+    ).hexdigest()
+    return (
+        current_jd.designation_id,
+        next_jd.designation_id,
+        current_jd.version,
+        next_jd.version,
+        digest,
+    )
+
+
+def get_learning_intents(current_role):
+    """
+    Returns the learning intents for moving up from ``current_role``, or
+    None when the role has no career path.
+    """
+    career = (
+        CareerPath.objects
+        .select_related("to_designation")
+        .filter(from_designation=current_role)
+        .first()
+    )
+    if not career:
+        return None
+
+    next_role = career.to_designation
+
+    current_jd = JobDescription.objects.filter(
+        designation=current_role, is_active=True
+    ).latest("version")
+
+    next_jd = JobDescription.objects.filter(
+        designation=next_role, is_active=True
+    ).latest("version")
+
+    context = build_role_context(current_role, current_jd, next_role, next_jd)
+    key = intent_cache_key(current_jd, next_jd, context)
+
+    intents = intent_cache.get(key)
+    if intents is not None:
+        return intents
+
+    with _lock_for(key):
+        # Another request may have filled it while we waited
+        intents = intent_cache.get(key)
+        if intents is None:
+            intents = extract_learning_intents(context)["learning_intents"]
+            intent_cache.set(key, intents, settings.INTENT_CACHE_TTL)
+
+    logger.info("Intent cache: %s", intent_cache.stats())
+    return intents
+
+
+async def aget_learning_intents(current_role):
+    """
+    Async variant of ``get_learning_intents`` for async views.
+    """
+    career = await (
+        CareerPath.objects
+        .select_related("to_designation")
+        .filter(from_designation=current_role)
+        .afirst()
+    )
+    if not career:
+        return None
+
+    next_role = career.to_designation
+
+    current_jd = await JobDescription.objects.filter(
+        designation=current_role, is_active=True
+    ).alatest("version")
+
+    next_jd = await JobDescription.objects.filter(
+        designation=next_role, is_active=True
+    ).alatest("version")
+
+    context = build_role_context(current_role, current_jd, next_role, next_jd)
+    key = intent_cache_key(current_jd, next_jd, context)
+
+    intents = await sync_to_async(intent_cache.get)(key)
+    if intents is not None:
+        return intents
+
+    async with _async_lock_for(key):
+        # Another request may have filled it while we waited
+        intents = await sync_to_async(intent_cache.get)(key)
+        if intents is None:
+            intents = (await aextract_learning_intents(context))["learning_intents"]
+            await sync_to_async(intent_cache.set)(key, intents, settings.INTENT_CACHE_TTL)
+
+    logger.info("Intent cache: %s", intent_cache.stats())
+    return intents
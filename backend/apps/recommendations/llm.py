@@ -1,11 +1,24 @@
 import json
-from openai import OpenAI
 import os
 from dotenv import load_dotenv
 
+from core import providers
+
 load_dotenv()
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+# Clients are built on first use, see core/providers.py
+@providers.register("openai")
+def openai_client():
+    from openai import OpenAI
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
+# For async views; requests wait on the event loop instead of a thread
+@providers.register("openai-async")
+def async_openai_client():
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 # def call_llm(prompt: str) -> str:
 #     response = client.chat.completions.create(
@@ -20,6 +33,8 @@ client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 #     return response.choices[0].message.content
 
 
+INTENT_MODEL = "gpt-4.1"
+
 # Intent prompt
 INTENT_PROMPT = """
 You are a career learning expert.
@@ -49,8 +64,8 @@ Schema:
 
 # extracting learning intents
 def extract_learning_intents(context: str) -> dict:
-    response = client.chat.completions.create(
-    model="gpt-4.1",
+    response = providers.get("openai").chat.completions.create(
+    model=INTENT_MODEL,
     messages=[
         {"role": "system", "content": INTENT_PROMPT},
         {"role": "user", "content": context}
@@ -58,4 +73,17 @@ def extract_learning_intents(context: str) -> dict:
     temperature=0.2
     )
     
-    return json.loads(response.choices[0].message.content)
\ No newline at end of file
+    return json.loads(response.choices[0].message.content)
+
+
+async def aextract_learning_intents(context: str) -> dict:
+    response = await providers.get("openai-async").chat.completions.create(
+        model=INTENT_MODEL,
+        messages=[
+            {"role": "system", "content": INTENT_PROMPT},
+            {"role": "user", "content": context}
+        ],
+        temperature=0.2
+    )
+
+    return json.loads(response.choices[0].message.content)
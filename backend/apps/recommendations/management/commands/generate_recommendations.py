@@ -0,0 +1,199 @@
+import json
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, transaction
+
+from apps.employees.models import Employee
+from apps.recommendations.models import Recommendation
+from apps.recommendations.services import (
+    build_recommendation_items,
+    build_recommendations,
+)
+from apps.recommendations.thumbnail_resolver import (
+    THUMBNAIL_CONTENT_TYPES,
+    resolve_page_thumbnails,
+)
+
+DEFAULT_CHECKPOINT = "generate_recommendations.checkpoint.json"
+
+
+class Command(BaseCommand):
+    help = (
+        'Precompute recommendations for all employees (or a department/designation). '
+        'Employees are grouped by designation so intents and searches run once per group.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--department', help='Only employees in this department (name)')
+        parser.add_argument('--designation', type=int, help='Only employees with this designation id')
+        parser.add_argument('--workers', type=int, default=4, help='Designation groups processed in parallel')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows per bulk insert')
+        parser.add_argument(
+            '--checkpoint',
+            default=DEFAULT_CHECKPOINT,
+            help='File recording finished designation groups',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Skip designation groups already recorded in the checkpoint file',
+        )
+
+    def handle(self, *args, **options):
+        filters = {
+            'department': options['department'],
+            'designation': options['designation'],
+        }
+        self.checkpoint_path = options['checkpoint']
+        self.batch_size = options['batch_size']
+
+        completed = self._load_checkpoint(filters) if options['resume'] else set()
+        self._checkpoint = {'filters': filters, 'completed': sorted(completed)}
+        self._save_checkpoint()
+
+        # Group employees by designation
+        employees = Employee.objects.select_related('designation').order_by('designation_id', 'id')
+        if filters['department']:
+            employees = employees.filter(department__name=filters['department'])
+        if filters['designation']:
+            employees = employees.filter(designation_id=filters['designation'])
+
+        groups = defaultdict(list)
+        for employee in employees:
+            if employee.designation_id not in completed:
+                groups[employee.designation_id].append(employee)
+
+        if completed:
+            self.stdout.write(f'Resuming: skipping {len(completed)} finished designation group(s)')
+
+        if not groups:
+            self.stdout.write(self.style.SUCCESS('Nothing to do.'))
+            return
+
+        self.stdout.write(
+            f'Generating recommendations for {sum(len(g) for g in groups.values())} employee(s) '
+            f'in {len(groups)} designation group(s) with {options["workers"]} worker(s)'
+        )
+
+        totals = {
+            'groups': 0,
+            'employees': 0,
+            'recommendations': 0,
+            'skipped': 0,
+            'failed': 0,
+        }
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            futures = {
+                executor.submit(self._process_group, members): designation_id
+                for designation_id, members in groups.items()
+            }
+            for future in as_completed(futures):
+                designation_id = futures[future]
+                members = groups[designation_id]
+                designation = members[0].designation
+
+                try:
+                    created, seconds = future.result()
+                except Exception as e:
+                    totals['failed'] += len(members)
+                    self.stderr.write(
+                        self.style.ERROR(f'{designation}: failed ({e})')
+                    )
+                    continue
+
+                totals['groups'] += 1
+                self._mark_completed(designation_id)
+
+                if created is None:
+                    totals['skipped'] += len(members)
+                    self.stdout.write(f'{designation}: no career path, skipped {len(members)} employee(s)')
+                    continue
+
+                totals['employees'] += len(members)
+                totals['recommendations'] += created
+                self.stdout.write(
+                    f'{designation}: {created} recommendation(s) for '
+                    f'{len(members)} employee(s) in {seconds:.1f}s'
+                )
+
+        elapsed = time.perf_counter() - started
+        rate = totals['employees'] / elapsed if elapsed else 0.0
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\nDone in {elapsed:.1f}s: {totals["groups"]} group(s), '
+                f'{totals["employees"]} employee(s), {totals["recommendations"]} recommendation(s), '
+                f'{totals["skipped"]} skipped, {totals["failed"]} failed '
+                f'({rate:.2f} employees/s)'
+            )
+        )
+        if totals['failed']:
+            self.stdout.write('Re-run with --resume to retry failed groups.')
+
+    # =========================
+    # Per-group work
+    # =========================
+    def _process_group(self, members):
+        """
+        Builds the group's candidates once and replaces every member's
+        recommendations in one transaction. Returns ``(rows created, seconds)``;
+        rows is None when the designation has no career path.
+        """
+        close_old_connections()
+        started = time.perf_counter()
+        try:
+            items = build_recommendation_items(members[0].designation)
+            if items is None:
+                return None, time.perf_counter() - started
+
+            # Shared pages, so resolve thumbnails up front instead of per row
+            thumbnails = resolve_page_thumbnails(
+                item['url'] for item in items if item['type'] in THUMBNAIL_CONTENT_TYPES
+            )
+
+            recs = []
+            for employee in members:
+                recs.extend(build_recommendations(employee, items, thumbnails))
+
+            with transaction.atomic():
+                Recommendation.objects.filter(employee__in=members).delete()
+                Recommendation.objects.bulk_create(recs, batch_size=self.batch_size)
+
+            return len(recs), time.perf_counter() - started
+        finally:
+            close_old_connections()
+
+    # =========================
+    # Checkpoint
+    # =========================
+    def _load_checkpoint(self, filters):
+        try:
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            return set()
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read checkpoint {self.checkpoint_path}: {e}')
+
+        if checkpoint.get('filters') != filters:
+            raise CommandError(
+                f'Checkpoint {self.checkpoint_path} was written for {checkpoint.get("filters")}; '
+                f'run with the same filters or without --resume'
+            )
+        return set(checkpoint.get('completed', []))
+
+    def _mark_completed(self, designation_id):
+        self._checkpoint['completed'].append(designation_id)
+        self._save_checkpoint()
+
+    def _save_checkpoint(self):
+        tmp_path = f'{self.checkpoint_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
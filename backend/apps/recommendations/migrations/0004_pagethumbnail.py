@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0003_recommendation_clicked_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageThumbnail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=500, unique=True)),
+                ('thumbnail_url', models.URLField(blank=True, max_length=500, null=True)),
+                ('fetched_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='recommendation',
+            name='thumbnail_url',
+            field=models.URLField(blank=True, max_length=500, null=True),
+        ),
+    ]
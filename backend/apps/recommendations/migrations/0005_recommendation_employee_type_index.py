@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0002_employee_last_visited_at'),
+        ('recommendations', '0004_pagethumbnail'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recommendation',
+            index=models.Index(fields=['employee', 'content_type', 'created_at'], name='recommendat_employe_d653e0_idx'),
+        ),
+    ]
@@ -11,9 +11,25 @@ class Recommendation(models.Model):
     employee = models.ForeignKey(Employee, on_delete=models.CASCADE)
     title = models.CharField(max_length=255)
     url = models.URLField()
-    thumbnail_url = models.URLField(blank=True, null=True)
+    thumbnail_url = models.URLField(max_length=500, blank=True, null=True)
     content_type = models.CharField(max_length=20, choices=CONTENT_TYPES)
     reason = models.TextField()
     clicked_at = models.DateTimeField(null=True, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # An employee's recommendations grouped by type: WHERE employee = ? ORDER BY content_type, created_at
+            models.Index(fields=['employee', 'content_type', 'created_at']),
+        ]
+
+
+class PageThumbnail(models.Model):
+    """
+    OpenGraph image resolved for a content URL, shared by every recommendation
+    pointing at that page. A null thumbnail_url records a page without og:image.
+    """
+    url = models.URLField(max_length=500, unique=True)
+    thumbnail_url = models.URLField(max_length=500, blank=True, null=True)
+    fetched_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,12 @@
+from rest_framework import serializers
+from apps.recommendations.models import Recommendation
+
+
+class RecommendationSerializer(serializers.ModelSerializer):
+    """
+    The columns the dashboard renders; also serializes ``.values()`` rows.
+    """
+    class Meta:
+        model = Recommendation
+        fields = ['id', 'title', 'url', 'thumbnail_url', 'content_type', 'reason', 'created_at']
+        read_only_fields = fields
@@ -1,19 +1,15 @@
 # services.py
-from concurrent.futures import ThreadPoolExecutor
-from apps.organization.models import JobDescription, CareerPath
-from apps.recommendations.fetchers.thumbnails import extract_og_thumbnail
-from .llm import extract_learning_intents
-from .fetchers.articles import ArticleFetcher
-from .fetchers.videos import VideoFetcher
-from .fetchers.courses import CourseFetcher
-from .validators import is_valid_url
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import transaction
+from .intents import aget_learning_intents, get_learning_intents
+from .engine import gather_recommendation_items
+from .thumbnail_resolver import (
+    THUMBNAIL_CONTENT_TYPES,
+    known_thumbnails,
+    schedule_thumbnail_resolution,
+)
 from .models import Recommendation
 
-# Fetcher instances
-article_fetcher = ArticleFetcher()
-video_fetcher = VideoFetcher()
-course_fetcher = CourseFetcher()
-
 # BUSINESS RULES
 ARTICLE_LIMIT = 15
 VIDEO_LIMIT = 5
@@ -24,115 +20,111 @@ VIDEO_PER_INTENT = 2
 COURSE_PER_INTENT = 2
 
 
+async def _gather_items(intents):
+    # Searches and URL validation all run concurrently
+    return await gather_recommendation_items(
+        intents,
+        per_intent={
+            "article": ARTICLE_PER_INTENT,
+            "video": VIDEO_PER_INTENT,
+            "course": COURSE_PER_INTENT,
+        },
+        limits={
+            "article": ARTICLE_LIMIT,
+            "video": VIDEO_LIMIT,
+            "course": COURSE_LIMIT,
+        },
+    )
+
+
+def build_recommendation_items(designation):
+    """
+    Returns the candidate items for everyone in ``designation``, or None
+    when the role has no career path. Intents, searches and URL checks only
+    depend on the role, so batch runs call this once per designation.
+    """
+    # Shared by everyone in the same role, see intents.py
+    intents = get_learning_intents(designation)
+    if intents is None:
+        return None
+
+    return async_to_sync(_gather_items)(intents)
+
+
+async def abuild_recommendation_items(designation):
+    intents = await aget_learning_intents(designation)
+    if intents is None:
+        return None
+
+    return await _gather_items(intents)
+
+
+def build_recommendations(employee, items, thumbnails):
+    return [
+        Recommendation(
+            employee=employee,
+            title=item["title"],
+            url=item["url"],
+            thumbnail_url=item["thumbnail_url"] or thumbnails.get(item["url"]),
+            content_type=item["type"],
+            reason=item["reason"],
+        )
+        for item in items
+    ]
+
+
+def replace_recommendations(employee, final_recs):
+    """
+    Swaps the employee's stored recommendations for ``final_recs`` in one
+    transaction, so readers never see an empty set and a failed insert
+    keeps the old ones.
+    """
+    with transaction.atomic():
+        Recommendation.objects.filter(employee=employee).delete()
+        Recommendation.objects.bulk_create(final_recs)
+
+
 def generate_recommendations(employee):
-    # Build role context
-    current_role = employee.designation
-    career = CareerPath.objects.filter(from_designation=current_role).first()
-    if not career:
+    items = build_recommendation_items(employee.designation)
+    if items is None:
         return []
 
-    next_role = career.to_designation
+    # Thumbnails already resolved for these pages; the rest are
+    # filled in by the background resolver after we return
+    thumbnails = known_thumbnails(
+        item["url"] for item in items if item["type"] in THUMBNAIL_CONTENT_TYPES
+    )
+
+    final_recs = build_recommendations(employee, items, thumbnails)
 
-    current_jd = JobDescription.objects.filter(
-        designation=current_role, is_active=True
-    ).latest("version")
+    replace_recommendations(employee, final_recs)
 
-    next_jd = JobDescription.objects.filter(
-        designation=next_role, is_active=True
-    ).latest("version")
+    schedule_thumbnail_resolution(
+        rec.id for rec in final_recs
+        if rec.content_type in THUMBNAIL_CONTENT_TYPES and rec.url not in thumbnails
+    )
+    return final_recs
 
-    context = f"""
-    Current Role: {current_role.name}
-    {current_jd.job_description}
 
-    Next Role: {next_role.name}
-    {next_jd.job_description}
+async def agenerate_recommendations(employee):
     """
+    Async variant of ``generate_recommendations``; ``employee.designation``
+    must already be loaded.
+    """
+    items = await abuild_recommendation_items(employee.designation)
+    if items is None:
+        return []
+
+    thumbnails = await sync_to_async(known_thumbnails)(
+        [item["url"] for item in items if item["type"] in THUMBNAIL_CONTENT_TYPES]
+    )
+
+    final_recs = build_recommendations(employee, items, thumbnails)
+
+    await sync_to_async(replace_recommendations)(employee, final_recs)
 
-    intents = extract_learning_intents(context)["learning_intents"]
-
-    Recommendation.objects.filter(employee=employee).delete()
-
-    final_recs = []
-    article_count = 0
-    video_count = 0
-    course_count = 0
-
-    with ThreadPoolExecutor(max_workers=6) as executor:
-        for intent in intents:
-            futures = [
-                executor.submit(
-                    article_fetcher.search,
-                    intent["search_queries"]["article"],
-                    ARTICLE_PER_INTENT,
-                ),
-                executor.submit(
-                    video_fetcher.search,
-                    intent["search_queries"]["video"],
-                    VIDEO_PER_INTENT,
-                ),
-                executor.submit(
-                    course_fetcher.search,
-                    intent["search_queries"]["course"],
-                    COURSE_PER_INTENT,
-                ),
-            ]
-
-            for future in futures:
-                for item in future.result():
-                    if not is_valid_url(item["url"]):
-                        continue
-
-                    if item["type"] == "article":
-                        if article_count >= ARTICLE_LIMIT:
-                            continue
-                        article_count += 1
-
-                    elif item["type"] == "video":
-                        if video_count >= VIDEO_LIMIT:
-                            continue
-                        video_count += 1
-
-                    elif item["type"] == "course":
-                        if course_count >= COURSE_LIMIT:
-                            continue
-                        course_count += 1
-                        
-                    # -----------------------
-                    # Resolve thumbnail
-                    # -----------------------
-                    thumbnail_url = None
-
-                    if item["type"] == "video":
-                        # YouTube thumbnail already provided
-                        thumbnail_url = item.get("thumbnail_url")
-                    elif item["type"] in ("article", "course"):
-                        # Try OpenGraph thumbnail
-                        thumbnail_url = extract_og_thumbnail(item["url"])
-
-                    # -----------------------
-                    # Create recommendation object
-                    # -----------------------
-
-
-                    final_recs.append(
-                        Recommendation(
-                            employee=employee,
-                            title=item["title"],
-                            url=item["url"],
-                            thumbnail_url=thumbnail_url,
-                            content_type=item["type"],
-                            reason=intent["reason"],
-                        )
-                    )
-
-                    # Hard stop if all caps reached
-                    if (
-                        article_count >= ARTICLE_LIMIT
-                        and video_count >= VIDEO_LIMIT
-                        and course_count >= COURSE_LIMIT
-                    ):
-                        break
-
-    Recommendation.objects.bulk_create(final_recs)
+    await sync_to_async(schedule_thumbnail_resolution)([
+        rec.id for rec in final_recs
+        if rec.content_type in THUMBNAIL_CONTENT_TYPES and rec.url not in thumbnails
+    ])
     return final_recs
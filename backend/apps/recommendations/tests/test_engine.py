@@ -0,0 +1,99 @@
+import asyncio
+import json
+import time
+import uuid
+from unittest import mock
+
+import httpx
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from apps.recommendations import engine
+from apps.recommendations.fetchers.cache import search_cache
+from apps.recommendations.http_client import DEFAULT_TIMEOUT, AsyncPolicyTransport
+from apps.recommendations.validators import validation_cache
+
+ROUND_TRIP = 0.2
+INTENTS = 8
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class Body(httpx.AsyncByteStream):
+    def __init__(self, content):
+        self.content = content
+
+    async def __aiter__(self):
+        yield self.content
+
+
+class SlowGoogleAPIs(httpx.AsyncBaseTransport):
+    """
+    Answers every search and HEAD after one round trip, like a multiplexed
+    HTTP/2 connection, and records the most requests seen in flight at once.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle_async_request(self, request):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(ROUND_TRIP)
+        finally:
+            self.in_flight -= 1
+
+        if request.method == "HEAD":
+            return httpx.Response(200, stream=Body(b""))
+
+        query = request.url.params["q"]
+        if request.url.path.startswith("/youtube"):
+            items = [{
+                "id": {"videoId": query},
+                "snippet": {"title": query, "thumbnails": {"high": {"url": "https://i.ytimg.com/x.jpg"}}},
+            }]
+        else:
+            items = [{"title": query, "link": f"https://example.com/{uuid.uuid4()}", "displayLink": "example.com"}]
+        return httpx.Response(200, stream=Body(json.dumps({"items": items}).encode()))
+
+
+@override_settings(CACHES=LOCMEM_CACHE, HTTP_HOST_CONCURRENCY={}, RECOMMENDATION_DEADLINE_SECONDS=20)
+class GatherRecommendationItemsTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        search_cache.local.clear()
+        validation_cache.local.clear()
+
+        self.transport = SlowGoogleAPIs()
+        client = lambda: httpx.AsyncClient(
+            transport=AsyncPolicyTransport(self.transport), timeout=DEFAULT_TIMEOUT
+        )
+        patcher = mock.patch.object(engine, "async_client", client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_intents_are_searched_in_one_round_trip(self):
+        intents = [
+            {
+                "reason": f"Intent {n}",
+                "search_queries": {
+                    content_type: f"{content_type} {n} {uuid.uuid4()}"
+                    for content_type in engine.CONTENT_TYPES
+                },
+            }
+            for n in range(INTENTS)
+        ]
+        per_intent = dict.fromkeys(engine.CONTENT_TYPES, 1)
+        limits = dict.fromkeys(engine.CONTENT_TYPES, 100)
+
+        started = time.perf_counter()
+        items = await engine.gather_recommendation_items(intents, per_intent, limits)
+        elapsed = time.perf_counter() - started
+
+        # 1 article, 1 video and 3 course searches per intent, all to www.googleapis.com
+        self.assertEqual(self.transport.max_in_flight, INTENTS * 5)
+        # One round trip of searches, one of URL validation
+        self.assertLess(elapsed, 3 * ROUND_TRIP)
+        self.assertEqual(len(items), INTENTS * 5)
@@ -0,0 +1,137 @@
+# thumbnail_resolver.py
+"""
+OpenGraph thumbnails for article and course recommendations.
+
+Resolved images are kept in ``PageThumbnail`` so each page is downloaded once
+for everybody. Pages that are not in the table yet are resolved on a
+background thread after the recommendations have been saved, which fills in
+``Recommendation.thumbnail_url`` without holding up the response.
+"""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .fetchers.thumbnails import aextract_og_thumbnail
+from .http_client import async_client
+from .models import PageThumbnail, Recommendation
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_CONTENT_TYPES = ("article", "course")
+
+# Pages without og:image are tried again after this long
+RETRY_MISSING_AFTER = timedelta(days=7)
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="thumbnail-resolver")
+
+
+def known_thumbnails(urls) -> dict:
+    """
+    Returns ``{url: thumbnail_url}`` for pages that have already been resolved.
+    ``thumbnail_url`` is None for pages known to have no og:image.
+    """
+    retry_before = timezone.now() - RETRY_MISSING_AFTER
+    rows = (
+        PageThumbnail.objects
+        .filter(url__in=list(urls))
+        .exclude(thumbnail_url__isnull=True, fetched_at__lt=retry_before)
+        .values_list("url", "thumbnail_url")
+    )
+    return dict(rows)
+
+
+async def _fetch_thumbnails(urls) -> dict:
+    async with async_client() as client:
+        thumbnails = await asyncio.gather(
+            *[aextract_og_thumbnail(client, url) for url in urls]
+        )
+    max_length = PageThumbnail._meta.get_field("thumbnail_url").max_length
+    return {
+        url: thumbnail_url if thumbnail_url and len(thumbnail_url) <= max_length else None
+        for url, thumbnail_url in zip(urls, thumbnails)
+    }
+
+
+def resolve_page_thumbnails(urls) -> dict:
+    """
+    Returns ``{url: thumbnail_url}`` for ``urls``, downloading and storing
+    pages that have not been resolved yet. Blocks until done.
+    """
+    urls = list(dict.fromkeys(urls))
+    thumbnails = known_thumbnails(urls)
+    missing = [url for url in urls if url not in thumbnails]
+
+    if missing:
+        fetched = async_to_sync(_fetch_thumbnails)(missing)
+        now = timezone.now()
+        PageThumbnail.objects.bulk_create(
+            [
+                PageThumbnail(url=url, thumbnail_url=thumbnail_url, fetched_at=now)
+                for url, thumbnail_url in fetched.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["url"],
+            update_fields=["thumbnail_url", "fetched_at"],
+        )
+        thumbnails.update(fetched)
+
+    return thumbnails
+
+
+def resolve_thumbnails(recommendation_ids) -> int:
+    """
+    Resolves and stores thumbnails for the given recommendations.
+    Blocks until done and returns the number of recommendations updated.
+    """
+    recs = Recommendation.objects.filter(
+        id__in=recommendation_ids,
+        content_type__in=THUMBNAIL_CONTENT_TYPES,
+        thumbnail_url__isnull=True,
+    ).values_list("id", "url")
+
+    ids_by_url = {}
+    for rec_id, url in recs:
+        ids_by_url.setdefault(url, []).append(rec_id)
+
+    if not ids_by_url:
+        return 0
+
+    thumbnails = resolve_page_thumbnails(ids_by_url)
+
+    updated = 0
+    for url, thumbnail_url in thumbnails.items():
+        if thumbnail_url:
+            updated += Recommendation.objects.filter(
+                id__in=ids_by_url[url]
+            ).update(thumbnail_url=thumbnail_url)
+
+    return updated
+
+
+def _resolve_in_background(recommendation_ids):
+    close_old_connections()
+    try:
+        resolve_thumbnails(recommendation_ids)
+    except Exception:
+        logger.exception("Thumbnail resolution failed")
+    finally:
+        close_old_connections()
+
+
+def schedule_thumbnail_resolution(recommendation_ids):
+    """
+    Resolves thumbnails on a background thread once the current
+    transaction commits, so the caller never waits on page downloads.
+    """
+    recommendation_ids = list(recommendation_ids)
+    if not recommendation_ids:
+        return
+
+    transaction.on_commit(
+        lambda: _executor.submit(_resolve_in_background, recommendation_ids)
+    )
@@ -1,8 +1,41 @@
-import requests
+from django.conf import settings
 
-def is_valid_url(url: str) -> bool:
+from core.cache import TieredCache
+
+# Shared by every worker, so a URL checked for one employee is reused
+# for everyone else who gets the same search results.
+validation_cache = TieredCache(
+    "url-valid",
+    max_entries=settings.URL_VALIDATION_CACHE_SIZE,
+)
+
+
+async def ais_valid_url(client, url: str) -> bool:
     try:
-        r = requests.head(url, timeout=5, allow_redirects=True)
+        r = await client.head(url, timeout=5, follow_redirects=True)
         return r.status_code == 200
-    except:
+    except Exception:
         return False
+
+
+def cached_url_checks(urls) -> dict:
+    """
+    Returns the cached validity of each known URL in ``urls``; unknown URLs are omitted.
+    """
+    return validation_cache.get_many(urls)
+
+
+def store_url_checks(results: dict) -> None:
+    """
+    Caches ``{url: is_valid}`` results. Valid URLs are kept for
+    URL_VALIDATION_TTL, invalid ones only for URL_VALIDATION_NEGATIVE_TTL
+    so transient failures are retried soon.
+    """
+    validation_cache.set_many(
+        {url: True for url, valid in results.items() if valid},
+        settings.URL_VALIDATION_TTL,
+    )
+    validation_cache.set_many(
+        {url: False for url, valid in results.items() if not valid},
+        settings.URL_VALIDATION_NEGATIVE_TTL,
+    )
@@ -4,6 +4,7 @@ from .models import (
     CourseRecommendation,
     ArticleRecommendation,
     AgentRecommendation,
+    RecommendationJob,
 )
 
 
@@ -58,3 +59,19 @@ class AgentRecommendationAdmin(admin.ModelAdmin):
     search_fields = ("name", "skill", "user__username", "user__email")
     readonly_fields = ("created_at",)
     ordering = ("name",)
+
+
+@admin.register(RecommendationJob)
+class RecommendationJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "user",
+        "profession",
+        "status",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status", "created_at")
+    search_fields = ("profession", "user__username", "user__email")
+    readonly_fields = ("created_at", "started_at", "finished_at")
+    ordering = ("-created_at",)
@@ -1,11 +1,11 @@
 from .video_agent import video_agent
 from .course_agent import course_agent
 from .article_agent import article_agent
-from .custom_agent_builder import custom_agent_creator
+from .custom_agent_builder import custom_agent_builder
 
 __all__ = [
     "video_agent",
     "course_agent",
     "article_agent",
-    "custom_agent_creator",
+    "custom_agent_builder",
 ]
@@ -1,23 +1,20 @@
 # apps/recommendations/agents/article_agent.py
 import asyncio
-from asgiref.sync import sync_to_async
 from typing import List
 from apps.recommendations_01.models import ArticleRecommendation
+from apps.recommendations_01.agents.persistence import areplace_recommendations
 from apps.recommendations_01.agents.llm_client import gemini_google_search
 from apps.recommendations_01.agents.prompts import ARTICLE_SYSTEM_PROMPT
 
 
-@sync_to_async
-def save_article(user, item):
-    return ArticleRecommendation.objects.create(
-        user=user,
-        skill=item.get("topic"),
-        title=item.get("title"),
-        description=item.get("description"),
-        url=item.get("url"),
-        source=item.get("source"),
-    )
-
+# Model field -> key in the LLM output
+ARTICLE_FIELDS = {
+    "skill": "topic",
+    "title": "title",
+    "description": "description",
+    "url": "url",
+    "source": "source",
+}
 
 
 # ==================================================
@@ -127,8 +124,14 @@ Do NOT include explanations, markdown, commentary, or extra text.
     print("\n\n\nArticle Agent Gemini Search Completed.\n\n\n")
     print(f"Results: {results}\n\n\n=========================")
 
-    for item in results:
-        await save_article(user, item)
+    # Replaces the user's previous article batch in one transaction and returns the saved rows
+    saved = await areplace_recommendations(
+        user,
+        ArticleRecommendation,
+        results,
+        ARTICLE_FIELDS,
+        required=("title", "url"),
+    )
 
     # print(f"\n\n\nArticle Agent Response: {results}")
 
@@ -141,4 +144,4 @@ Do NOT include explanations, markdown, commentary, or extra text.
     #         url=item.get("url"),
     #         source=item.get("source"),
     #     )
-    return results
\ No newline at end of file
+    return saved
\ No newline at end of file
@@ -1,22 +1,20 @@
 # apps/recommendations/agents/course_agent.py
 import asyncio
-from asgiref.sync import sync_to_async
 from typing import List
 from apps.recommendations_01.models import CourseRecommendation
+from apps.recommendations_01.agents.persistence import areplace_recommendations
 from apps.recommendations_01.agents.llm_client import gemini_google_search
 from apps.recommendations_01.agents.prompts import COURSE_SYSTEM_PROMPT
 
 
-@sync_to_async
-def save_course(user, item):
-    return CourseRecommendation.objects.create(
-        user=user,
-        skill=item.get("topic"),
-        title=item.get("title"),
-        description=item.get("description"),
-        url=item.get("url"),
-        source=item.get("platform"),
-    )
+# Model field -> key in the LLM output
+COURSE_FIELDS = {
+    "skill": "topic",
+    "title": "title",
+    "description": "description",
+    "url": "url",
+    "source": "platform",
+}
 
 
 # =================================================
@@ -131,8 +129,14 @@ Do NOT include explanations, markdown, or extra text.
     print("\n\n\nCourse Agent Gemini Search Completed.\n\n\n")
     print(f"Results: {results}\n\n\n=======================")
     
-    for item in results:
-        await save_course(user, item)
+    # Replaces the user's previous course batch in one transaction and returns the saved rows
+    saved = await areplace_recommendations(
+        user,
+        CourseRecommendation,
+        results,
+        COURSE_FIELDS,
+        required=("title", "url"),
+    )
 
     # print(f"\n\n\nCourse Agent Response: {results}")
 
@@ -146,4 +150,4 @@ Do NOT include explanations, markdown, or extra text.
     #         source=item.get("platform"),
     #     )
 
-    return results
+    return saved
@@ -1,20 +1,19 @@
 # apps/recommendations/agents/custom_agent.py
 import asyncio
-from asgiref.sync import sync_to_async
 from typing import List
 from apps.recommendations_01.models import AgentRecommendation
+from apps.recommendations_01.agents.persistence import areplace_recommendations
 from apps.recommendations_01.agents.llm_client import generate_future_agent_prompts
 
 
 
-@sync_to_async
-def save_custom_agents(user, item):
-    return AgentRecommendation.objects.create(
-        user=user,
-        skill=item.get("Skills"),
-        name=item.get("Name"),
-        system_prompt=item.get("System_prompt"),
-    )
+# Model field -> key in the LLM output
+AGENT_FIELDS = {
+    "skill": "Skills",
+    "name": "Name",
+    "system_prompt": "System_prompt",
+}
+
 
 # ==================================================
 async def custom_agent_builder(
@@ -123,7 +122,13 @@ IMPORTANT CONSTRAINTS
     print("\n\n\nCustom Agent building Completed.\n\n\n")
     print(f"Results: {results}\n\n\n=========================")
 
-    for item in results:
-        await save_custom_agents(user, item)
+    # Replaces the user's previous agent batch in one transaction and returns the saved rows
+    saved = await areplace_recommendations(
+        user,
+        AgentRecommendation,
+        results,
+        AGENT_FIELDS,
+        required=("name", "system_prompt"),
+    )
 
-    return results
+    return saved
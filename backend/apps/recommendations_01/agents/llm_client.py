@@ -3,14 +3,18 @@ import json
 import sys
 from typing import List, Dict
 
-from google import genai
+from core import providers
 
 
 
 GEMINI_MODEL = "gemini-2.5-flash-preview-09-2025"
 
 
-client = genai.Client()
+# Built on first use, see core/providers.py
+@providers.register("genai")
+def genai_client():
+    from google import genai
+    return genai.Client()
 
 
 
@@ -95,7 +99,7 @@ def gemini_google_search(
     Uses Gemini 2.5 Flash with Google Search tool to get recommendations.
     """
     
-    response = client.models.generate_content(
+    response = providers.get("genai").models.generate_content(
         model=GEMINI_MODEL,
         contents=system_prompt,
         config={
@@ -124,7 +128,7 @@ def gemini_google_search(
 # ==================================================
 def generate_future_agent_prompts(system_prompt: str) -> list[dict]:
     
-    response = client.models.generate_content(
+    response = providers.get("genai").models.generate_content(
         model=GEMINI_MODEL,
         contents=system_prompt,
         config={
@@ -0,0 +1,83 @@
+# apps/recommendations_01/agents/persistence.py
+"""
+Shared persistence for the agent outputs.
+
+Each agent's parsed items are validated and mapped onto its model, then
+the user's previous batch is replaced by the new one with a single
+``bulk_create`` in one transaction, so readers see either the old set or
+the new one, never a half-written mix.
+"""
+import logging
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+validate_url = URLValidator(schemes=["http", "https"])
+
+
+def _clean_item(model, item, field_map, required, defaults):
+    """
+    Maps one LLM item onto model fields. Returns None if it is unusable.
+    """
+    if not isinstance(item, dict):
+        return None
+
+    row = {}
+    for field_name, key in field_map.items():
+        value = item.get(key)
+        if value is None or (isinstance(value, str) and not value.strip()):
+            value = defaults.get(field_name, "")
+        value = str(value).strip()
+
+        if not value and field_name in required:
+            return None
+
+        max_length = model._meta.get_field(field_name).max_length
+        if max_length and len(value) > max_length:
+            # A truncated URL points somewhere else; drop the item instead
+            if field_name == "url":
+                return None
+            value = value[:max_length]
+
+        row[field_name] = value
+
+    if "url" in row:
+        try:
+            validate_url(row["url"])
+        except ValidationError:
+            return None
+
+    return row
+
+
+def replace_recommendations(user, model, items, field_map, required=(), defaults=None):
+    """
+    Replaces ``user``'s rows of ``model`` with the valid ``items``.
+
+    ``field_map`` maps model fields to keys of the LLM items. Items missing
+    a ``required`` field or carrying an invalid URL are skipped. When no
+    item is valid, the previous batch is kept. Returns the created rows.
+    """
+    defaults = defaults or {}
+    rows = []
+    for item in items or []:
+        row = _clean_item(model, item, field_map, required, defaults)
+        if row is None:
+            logger.warning("Skipping invalid %s item: %r", model.__name__, item)
+            continue
+        rows.append(model(user=user, **row))
+
+    if not rows:
+        logger.warning("No valid %s items for %s; keeping previous batch", model.__name__, user)
+        return []
+
+    with transaction.atomic():
+        model.objects.filter(user=user).delete()
+        return model.objects.bulk_create(rows)
+
+
+areplace_recommendations = sync_to_async(replace_recommendations)
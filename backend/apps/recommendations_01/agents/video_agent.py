@@ -1,25 +1,22 @@
 # apps/recommendations/agents/video_agent.py
 import asyncio
-from asgiref.sync import sync_to_async
 from typing import List
 from apps.recommendations_01.models import VideoRecommendation
+from apps.recommendations_01.agents.persistence import areplace_recommendations
 from apps.recommendations_01.agents.llm_client import gemini_google_search
 from apps.recommendations_01.agents.prompts import VIDEO_SYSTEM_PROMPT
 
 
-# 
-@sync_to_async
-def save_video(user, item):
-    return VideoRecommendation.objects.create(
-        user=user,
-        skill=item.get("topic"),
-        title=item.get("title"),
-        description=item.get("description"),
-        url=item.get("url"),
-        source=item.get("source", "YouTube"),
-    )
-    
-    
+# Model field -> key in the LLM output
+VIDEO_FIELDS = {
+    "skill": "topic",
+    "title": "title",
+    "description": "description",
+    "url": "url",
+    "source": "source",
+}
+
+
 #  =================================================
 async def video_agent(
     user,
@@ -111,7 +108,14 @@ Do NOT include explanations or extra text.
     print("\n\n\nVideo Agent Gemini Search Completed.\n\n\n")
     print(f"Results: {results}\n\n\n=========================")
     
-    for item in results:
-        await save_video(user, item)
+    # Replaces the user's previous video batch in one transaction and returns the saved rows
+    saved = await areplace_recommendations(
+        user,
+        VideoRecommendation,
+        results,
+        VIDEO_FIELDS,
+        required=("title", "url"),
+        defaults={"source": "YouTube"},
+    )
         
-    return results
\ No newline at end of file
+    return saved
\ No newline at end of file
@@ -0,0 +1,203 @@
+# jobs.py
+"""
+DB-backed queue for recommendation generation.
+
+The API only records a ``RecommendationJob`` and returns; the
+``run_recommendation_jobs`` worker claims queued jobs with
+``SELECT ... FOR UPDATE SKIP LOCKED`` (so several workers can run side by
+side) and runs the four agents concurrently, saving each agent's progress
+and timing on the job as it goes.
+"""
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Func, Value
+from django.utils import timezone
+
+from apps.chatbot.models import UserMessage
+from apps.recommendations_01.agents import (
+    article_agent,
+    course_agent,
+    custom_agent_builder,
+    video_agent,
+)
+
+from .models import RecommendationJob
+
+logger = logging.getLogger(__name__)
+
+AGENTS = {
+    "video": video_agent,
+    "article": article_agent,
+    "course": course_agent,
+    "custom_agent": custom_agent_builder,
+}
+
+# Questions passed to the agents
+HISTORY_LIMIT = 50
+
+
+# =========================
+# Submission
+# =========================
+def active_job_for(user):
+    return (
+        RecommendationJob.objects
+        .filter(user=user, status__in=RecommendationJob.ACTIVE_STATUSES)
+        .first()
+    )
+
+
+def submit_job(user, profession):
+    """
+    Queues a job for ``user`` and returns ``(job, created)``. While the user
+    already has a queued or running job, that job is returned instead.
+    """
+    job = active_job_for(user)
+    if job:
+        return job, False
+
+    try:
+        with transaction.atomic():
+            job = RecommendationJob.objects.create(
+                user=user,
+                profession=profession,
+                agent_progress={name: "pending" for name in AGENTS},
+            )
+    except IntegrityError:
+        # A concurrent submission won the unique_active_recommendation_job race
+        job = active_job_for(user)
+        if job is None:
+            raise
+        return job, False
+
+    return job, True
+
+
+# =========================
+# Worker side
+# =========================
+def claim_next_job():
+    """
+    Marks the oldest queued job as running and returns it, or None.
+    Jobs locked by another worker are skipped.
+    """
+    with transaction.atomic():
+        job = (
+            RecommendationJob.objects
+            .select_for_update(skip_locked=True, of=("self",))
+            # The agents get job.user in async code, where lazy loads are not allowed
+            .select_related("user")
+            .filter(status=RecommendationJob.STATUS_QUEUED)
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+
+        job.status = RecommendationJob.STATUS_RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "started_at"])
+
+    return job
+
+
+def fail_stale_jobs(older_than):
+    """
+    Fails jobs left running by a worker that died, so their users can submit again.
+    """
+    return RecommendationJob.objects.filter(
+        status=RecommendationJob.STATUS_RUNNING,
+        started_at__lt=timezone.now() - timedelta(seconds=older_than),
+    ).update(
+        status=RecommendationJob.STATUS_FAILED,
+        error="Worker stopped before the job finished.",
+        finished_at=timezone.now(),
+    )
+
+
+class JSONBMerge(Func):
+    """
+    ``field || value``: sets the keys of ``value`` on a jsonb column in the
+    UPDATE itself.
+    """
+    template = "%(expressions)s"
+    arg_joiner = " || "
+    output_field = models.JSONField()
+
+
+async def _save_agent_state(job, name, **fields):
+    """
+    Records ``name``'s entry in the given per-agent JSON fields (e.g.
+    ``agent_progress="done"``). Each agent only writes its own key, merged
+    into the column by the database, so the agents running side by side
+    don't overwrite each other's entries.
+    """
+    await RecommendationJob.objects.filter(pk=job.pk).aupdate(**{
+        field: JSONBMerge(F(field), Value({name: value}, output_field=models.JSONField()))
+        for field, value in fields.items()
+    })
+    for field, value in fields.items():
+        getattr(job, field)[name] = value
+
+
+async def _run_agent(job, name, agent, history):
+    await _save_agent_state(job, name, agent_progress="running")
+
+    started = time.perf_counter()
+    try:
+        saved = await agent(job.user, job.profession, history)
+    except Exception as e:
+        logger.exception("Agent %s failed for job %s", name, job.id)
+        await _save_agent_state(
+            job, name,
+            agent_progress="failed",
+            agent_timings=round(time.perf_counter() - started, 3),
+        )
+        return f"{name}: {e}"
+
+    await _save_agent_state(
+        job, name,
+        agent_progress="done",
+        agent_timings=round(time.perf_counter() - started, 3),
+        # Rows created, not the items the LLM returned
+        results=len(saved),
+    )
+    return None
+
+
+async def _run_agents(job):
+    history = await sync_to_async(list)(
+        UserMessage.objects
+        .filter(user=job.user)
+        .values_list("content", flat=True)[:HISTORY_LIMIT]
+    )
+
+    errors = await asyncio.gather(
+        *[_run_agent(job, name, agent, history) for name, agent in AGENTS.items()]
+    )
+    return [error for error in errors if error]
+
+
+def run_job(job):
+    """
+    Runs every agent for a claimed job and records the outcome. The job
+    fails if any agent fails; results of the other agents are kept.
+    """
+    try:
+        errors = async_to_sync(_run_agents)(job)
+    except Exception as e:
+        logger.exception("Recommendation job %s failed", job.id)
+        errors = [str(e)]
+
+    job.status = (
+        RecommendationJob.STATUS_FAILED if errors else RecommendationJob.STATUS_SUCCEEDED
+    )
+    job.error = "\n".join(errors)
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "error", "finished_at"])
+    return job
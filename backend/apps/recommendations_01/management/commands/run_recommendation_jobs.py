@@ -0,0 +1,54 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.recommendations_01.jobs import claim_next_job, fail_stale_jobs, run_job
+
+
+class Command(BaseCommand):
+    help = 'Run queued recommendation generation jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument(
+            '--stale-after',
+            type=int,
+            default=900,
+            help='Fail jobs that have been running longer than this many seconds',
+        )
+        parser.add_argument('--once', action='store_true', help='Drain the queue and exit')
+
+    def handle(self, *args, **options):
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        self.stdout.write('Recommendation job worker started')
+
+        while not self._stopping:
+            close_old_connections()
+
+            stale = fail_stale_jobs(options['stale_after'])
+            if stale:
+                self.stdout.write(self.style.WARNING(f'Marked {stale} stale job(s) as failed'))
+
+            job = claim_next_job()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f'Running job {job.id} for {job.user}')
+            run_job(job)
+
+            style = self.style.SUCCESS if job.status == job.STATUS_SUCCEEDED else self.style.ERROR
+            self.stdout.write(style(f'Job {job.id} {job.status}: {job.agent_timings}'))
+
+        self.stdout.write('Recommendation job worker stopped')
+
+    def _stop(self, signum, frame):
+        # Finish the current job, then exit
+        self._stopping = True
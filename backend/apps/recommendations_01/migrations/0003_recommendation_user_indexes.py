@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations_01', '0002_recommendationjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='articlerecommendation',
+            index=models.Index(fields=['user', '-created_at'], name='recommendat_user_id_e76c2a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='courserecommendation',
+            index=models.Index(fields=['user', '-created_at'], name='recommendat_user_id_7c3027_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='videorecommendation',
+            index=models.Index(fields=['user', '-created_at'], name='recommendat_user_id_4c93be_idx'),
+        ),
+    ]
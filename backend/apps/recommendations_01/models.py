@@ -1,3 +1,5 @@
+import uuid
+
 from django.conf import settings
 from django.db import models
 
@@ -23,6 +25,10 @@ class VideoRecommendation(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Per-user list: WHERE user = ? ORDER BY created_at DESC
+            models.Index(fields=["user", "-created_at"]),
+        ]
         
 
 # Course Recommendation Model
@@ -46,6 +52,10 @@ class CourseRecommendation(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Per-user list: WHERE user = ? ORDER BY created_at DESC
+            models.Index(fields=["user", "-created_at"]),
+        ]
 
 
 
@@ -70,6 +80,10 @@ class ArticleRecommendation(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Per-user list: WHERE user = ? ORDER BY created_at DESC
+            models.Index(fields=["user", "-created_at"]),
+        ]
 
 
 # Agent Recommendation Model
@@ -89,4 +103,57 @@ class AgentRecommendation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ["name"]
\ No newline at end of file
+        ordering = ["name"]
+
+
+# Recommendation Generation Job
+# ==================================================
+class RecommendationJob(models.Model):
+    """
+    One run of the recommendation agents, queued by GenerateRecommendationsView
+    and executed by the ``run_recommendation_jobs`` worker.
+    """
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = (
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    )
+    ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="recommendation_jobs"
+    )
+
+    profession = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+
+    # Per agent: {"video": "running", ...} and {"video": 12.3, ...} (seconds)
+    agent_progress = models.JSONField(default=dict, blank=True)
+    agent_timings = models.JSONField(default=dict, blank=True)
+    # Per agent: number of recommendations saved
+    results = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            # At most one queued/running job per user
+            models.UniqueConstraint(
+                fields=["user"],
+                condition=models.Q(status__in=["queued", "running"]),
+                name="unique_active_recommendation_job",
+            ),
+        ]
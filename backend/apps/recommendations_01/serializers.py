@@ -4,6 +4,7 @@ from .models import (
     CourseRecommendation,
     ArticleRecommendation,
     AgentRecommendation,
+    RecommendationJob,
 )
 
 
@@ -59,3 +60,20 @@ class AgentRecommendationSerializer(serializers.ModelSerializer):
             "system_prompt",
             "created_at",
         ]
+
+
+class RecommendationJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RecommendationJob
+        fields = [
+            "id",
+            "profession",
+            "status",
+            "agent_progress",
+            "agent_timings",
+            "results",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
@@ -1,6 +1,7 @@
 from rest_framework.routers import DefaultRouter
 from apps.recommendations_01.views import (
     GenerateRecommendationsView,
+    RecommendationJobDetailView,
     VideoRecommendationViewSet,
     CourseRecommendationViewSet,
     ArticleRecommendationViewSet,
@@ -40,5 +41,10 @@ urlpatterns = router.urls + [
         GenerateRecommendationsView.as_view(),
         name="generate-recommendations",
     ),
+    path(
+        "jobs/<uuid:pk>/",
+        RecommendationJobDetailView.as_view(),
+        name="recommendation-job-detail",
+    ),
 ]
 
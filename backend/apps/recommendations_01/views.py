@@ -1,28 +1,27 @@
 from rest_framework.viewsets import ReadOnlyModelViewSet
 from rest_framework.permissions import IsAuthenticated
-import asyncio
-from asgiref.sync import async_to_sync
+from django.urls import reverse
+from rest_framework.generics import RetrieveAPIView
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
 from apps.chatbot.models import UserMessage
-from apps.recommendations_01.agents.article_agent import article_agent
-from apps.recommendations_01.agents.course_agent import course_agent
-from apps.recommendations_01.agents.custom_agent_builder import custom_agent_builder
-from apps.recommendations_01.agents.video_agent import video_agent
+from apps.recommendations_01.jobs import submit_job
 
 from .models import (
     VideoRecommendation,
     CourseRecommendation,
     ArticleRecommendation,
     AgentRecommendation,
+    RecommendationJob,
 )
 from .serializers import (
     VideoRecommendationSerializer,
     CourseRecommendationSerializer,
     ArticleRecommendationSerializer,
     AgentRecommendationSerializer,
+    RecommendationJobSerializer,
 )
 
 
@@ -77,6 +76,14 @@ class AgentRecommendationViewSet(ReadOnlyModelViewSet):
 # Recommendation Generation API VIEW
 # =============================
 class GenerateRecommendationsView(APIView):
+    """
+    API endpoint to queue recommendation generation for the current user.
+    POST /api/recommendations_01/generate/
+
+    Returns 202 with the job; poll GET /api/recommendations_01/jobs/<id>/
+    for progress. While a job is queued or running for the user, that job
+    is returned instead of starting another one.
+    """
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -86,51 +93,31 @@ class GenerateRecommendationsView(APIView):
         if not profession:
             return Response({"detail": "Profession is required."}, status=400)
         
-        # Fetch all user messages directly
-        user_questions = UserMessage.objects.filter(
-            user=user
-        ).values_list('content', flat=True)
-
-        if not user_questions:
+        if not UserMessage.objects.filter(user=user).exists():
             return Response({"detail": "No questions found for analysis."}, status=400)
 
-        # 2. Convert QuerySet to list for the agents
-        history_context_list = list(user_questions)[:50]
-        
-        print("History Context List:", history_context_list)
-
-        async def run_agents_parallel():
-            # Create tasks
-            video_task = video_agent(user, profession, history_context_list)
-            article_task = article_agent(user, profession, history_context_list)
-            course_task = course_agent(user, profession, history_context_list)
-            custom_agent_task = custom_agent_builder(user, profession, history_context_list)
-
-            # Run them concurrently
-            return await asyncio.gather(
-                video_task,
-                article_task,
-                course_task,
-                custom_agent_task
-            )
-            
-        try:
-            video_results, article_results, course_results, custom_agent_results = async_to_sync(run_agents_parallel)()
-        except Exception as e:
-            # Good practice to catch agent errors
-            return Response(
-                {"error": str(e), "detail": "Error running AI agents"}, 
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-
-        return Response(
-            {
-                "status": "success",
-                "video_recommendations": len(video_results),
-                "article_recommendations": len(article_results),
-                "course_recommendations": len(course_results),
-                "custom_agent_recommendations": len(custom_agent_results),
-            },
-            status=status.HTTP_201_CREATED
+        job, _ = submit_job(user, profession)
+
+        response = Response(
+            RecommendationJobSerializer(job).data,
+            status=status.HTTP_202_ACCEPTED
         )
+        response["Location"] = reverse(
+            "recommendation-job-detail", kwargs={"pk": job.pk}
+        )
+        return response
+
 
+# ===============================
+# Recommendation Job Status API VIEW
+# =============================
+class RecommendationJobDetailView(RetrieveAPIView):
+    """
+    API endpoint to poll a recommendation generation job.
+    GET /api/recommendations_01/jobs/<id>/
+    """
+    serializer_class = RecommendationJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return RecommendationJob.objects.filter(user=self.request.user)
@@ -0,0 +1,83 @@
+"""
+Measures process startup: Django setup plus loading the URLconf (what every
+worker and most management commands do), and a full ``manage.py`` command.
+
+Each measurement runs in a fresh interpreter so nothing is cached between
+runs. It also lists which AI SDKs were imported along the way; with the
+lazy provider registry (core/providers.py) there should be none.
+
+    python benchmark_startup.py
+    python benchmark_startup.py --runs 10 --command check_inactive_users
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+HEAVY_MODULES = [
+    "google.generativeai",
+    "google.genai",
+    "langchain_core",
+    "langchain_google_genai",
+    "langchain_google_community",
+    "langgraph",
+    "openai",
+    "psycopg_pool",
+]
+
+IMPORT_SNIPPET = f"""
+import json, sys
+import django
+django.setup()
+import core.urls
+print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))
+"""
+
+
+def timed(args):
+    started = time.perf_counter()
+    result = subprocess.run(args, cwd=BASE_DIR, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        sys.exit(f"{' '.join(args)} failed:\n{result.stderr}")
+    return elapsed, result.stdout
+
+
+def report(label, timings):
+    print(
+        f"{label:<40} median {statistics.median(timings):6.2f}s  "
+        f"min {min(timings):6.2f}s  max {max(timings):6.2f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--command", default="check", help="manage.py command to time")
+    options = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+    import_timings, loaded = [], []
+    for _ in range(options.runs):
+        elapsed, output = timed([sys.executable, "-c", IMPORT_SNIPPET])
+        import_timings.append(elapsed)
+        loaded = json.loads(output.strip().splitlines()[-1])
+
+    command_timings = [
+        timed([sys.executable, "manage.py", options.command])[0]
+        for _ in range(options.runs)
+    ]
+
+    report("django.setup() + URLconf", import_timings)
+    report(f"manage.py {options.command}", command_timings)
+    print(f"AI SDKs imported at startup: {', '.join(loaded) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Two-tier caching helpers shared by the apps.
+
+``LRUCache`` is a bounded, thread-safe in-process cache with per-entry TTLs.
+``TieredCache`` puts one in front of a Django cache backend (database or
+Redis, see ``CACHES`` in settings) so every gunicorn worker reuses the same
+entries while hot keys never leave the process.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+class LRUCache:
+    """
+    Bounded in-process cache with per-entry TTLs and hit/miss counters.
+    The least recently used entry is evicted once ``max_entries`` is reached.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] <= time.time():
+                del self._data[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl):
+        self.set_until(key, value, time.time() + ttl)
+
+    def set_until(self, key, value, expires_at):
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TieredCache:
+    """
+    In-process ``LRUCache`` backed by a shared Django cache.
+
+    Shared entries carry their absolute expiry, so a value promoted into the
+    local tier never outlives the TTL it was written with. Failures of the
+    shared backend are logged and treated as misses.
+    """
+
+    def __init__(self, namespace, max_entries=1024, alias="default"):
+        self.namespace = namespace
+        self.alias = alias
+        self.local = LRUCache(max_entries)
+        self.shared_hits = 0
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def _shared_key(self, key):
+        digest = hashlib.sha1(str(key).encode()).hexdigest()
+        return f"{self.namespace}:{digest}"
+
+    def get(self, key, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def get_many(self, keys):
+        found = {}
+        missing = []
+        for key in keys:
+            value = self.local.get(key, MISSING)
+            if value is MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+
+        if not missing:
+            return found
+
+        shared_keys = {self._shared_key(key): key for key in missing}
+        try:
+            entries = self.shared.get_many(list(shared_keys))
+        except Exception:
+            logger.exception("Shared cache read failed for %s", self.namespace)
+            entries = {}
+
+        now = time.time()
+        for shared_key, (value, expires_at) in entries.items():
+            if expires_at <= now:
+                continue
+            key = shared_keys[shared_key]
+            self.local.set_until(key, value, expires_at)
+            found[key] = value
+            self.shared_hits += 1
+
+        return found
+
+    def set(self, key, value, ttl):
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, mapping, ttl):
+        if not mapping:
+            return
+
+        expires_at = time.time() + ttl
+        for key, value in mapping.items():
+            self.local.set_until(key, value, expires_at)
+
+        try:
+            self.shared.set_many(
+                {
+                    self._shared_key(key): (value, expires_at)
+                    for key, value in mapping.items()
+                },
+                timeout=ttl,
+            )
+        except Exception:
+            logger.exception("Shared cache write failed for %s", self.namespace)
+
+    def delete(self, key):
+        self.local.delete(key)
+        try:
+            self.shared.delete(self._shared_key(key))
+        except Exception:
+            logger.exception("Shared cache delete failed for %s", self.namespace)
+
+    def stats(self):
+        local_hits = self.local.hits
+        # Every shared hit was first counted as a local miss
+        misses = self.local.misses - self.shared_hits
+        lookups = local_hits + self.shared_hits + misses
+        return {
+            "hits": local_hits + self.shared_hits,
+            "local_hits": local_hits,
+            "shared_hits": self.shared_hits,
+            "misses": misses,
+            "hit_rate": round((local_hits + self.shared_hits) / lookups, 3) if lookups else 0.0,
+            "local_entries": len(self.local),
+        }
@@ -0,0 +1,65 @@
+"""
+Concurrency limits for long-running async views (LLM calls, web searches).
+
+Under ASGI a waiting request costs a coroutine rather than a worker, so
+without a cap a burst of chats would all be sent upstream at once. Each
+limit is a semaphore per worker process (per event loop), sized from
+``settings.CONCURRENCY_LIMITS``; requests wait up to
+``CONCURRENCY_QUEUE_TIMEOUT`` seconds for a slot and then get a 503.
+
+    async with ConcurrencyLimit("chat"):
+        ...
+"""
+import asyncio
+import weakref
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+# event loop -> {limit name: semaphore}
+_semaphores = weakref.WeakKeyDictionary()
+
+
+class ServiceOverloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "The server is busy, please try again shortly."
+    default_code = "service_overloaded"
+
+
+class ConcurrencyLimit:
+    def __init__(self, name):
+        self.name = name
+
+    def _semaphore(self):
+        size = settings.CONCURRENCY_LIMITS.get(self.name)
+        if not size:
+            return None
+        semaphores = _semaphores.setdefault(asyncio.get_running_loop(), {})
+        if self.name not in semaphores:
+            semaphores[self.name] = asyncio.Semaphore(size)
+        return semaphores[self.name]
+
+    def saturated(self):
+        """
+        True if no slot is free right now; lets streaming views answer 503
+        before they start the stream.
+        """
+        semaphore = self._semaphore()
+        return semaphore is not None and semaphore.locked()
+
+    async def __aenter__(self):
+        self._held = self._semaphore()
+        if self._held is None:
+            return self
+        try:
+            await asyncio.wait_for(self._held.acquire(), settings.CONCURRENCY_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            self._held = None
+            raise ServiceOverloaded()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._held is not None:
+            self._held.release()
+            self._held = None
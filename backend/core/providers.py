@@ -0,0 +1,63 @@
+"""
+Process-wide registry of lazily built AI provider clients.
+
+The AI SDKs are slow to import and some clients need credentials, or open
+connections, as soon as they are constructed. Modules therefore register a
+factory here instead of building clients at import time:
+
+    @providers.register("openai")
+    def openai_client():
+        from openai import OpenAI
+        return OpenAI(...)
+
+    providers.get("openai").chat.completions.create(...)
+
+``get`` builds the client on first use and returns the same instance after
+that, so management commands and requests that never call a provider never
+pay for it.
+"""
+import threading
+
+_factories = {}
+_instances = {}
+# Reentrant: a factory may get() another provider
+_lock = threading.RLock()
+
+
+def register(name, factory=None):
+    """
+    Registers ``factory`` under ``name``; usable as a decorator.
+    """
+    if factory is None:
+        return lambda func: register(name, func)
+    _factories[name] = factory
+    return factory
+
+
+def get(name):
+    try:
+        return _instances[name]
+    except KeyError:
+        pass
+
+    with _lock:
+        if name not in _instances:
+            _instances[name] = _factories[name]()
+        return _instances[name]
+
+
+def reset(*names):
+    """
+    Drops built clients (all of them without ``names``) so the next ``get``
+    builds them again, e.g. after rotating credentials or in tests.
+    """
+    with _lock:
+        for name in names or list(_instances):
+            _instances.pop(name, None)
+
+
+def loaded():
+    """
+    Names of the providers built so far in this process.
+    """
+    return sorted(_instances)
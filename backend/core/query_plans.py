@@ -0,0 +1,159 @@
+"""
+EXPLAIN checks for the per-user list queries.
+
+``hot_queries()`` builds each list endpoint's query the way its view does,
+together with the index that should serve it, and ``plan_regressions()``
+reports what in a query's plan shows it is not served by that index: the
+index missing from the plan, a Seq Scan, or a Sort where the index should
+provide the order. Used by the ``check_query_plans`` command and the tests
+in core/tests/test_query_plans.py.
+"""
+import json
+
+from django.db import connection
+
+from apps.certifications.models import Certification
+from apps.chatbot.models import ChatThread, ThreadMessage
+from apps.chats.models import Chat, Message
+from apps.employees.models import Employee
+from apps.notifications.models import Notification
+from apps.recommendations.models import Recommendation
+from apps.recommendations_01.models import (
+    ArticleRecommendation,
+    CourseRecommendation,
+    VideoRecommendation,
+)
+
+# Lists whose few rows per owner are sorted after the foreign key lookup
+# rather than read in order from a composite index
+SORTED_AFTER_LOOKUP = {'GET /api/employees/certifications/'}
+
+
+def _sample(model, field, default):
+    value = model.objects.order_by().values_list(field, flat=True).first()
+    return default if value is None else value
+
+
+def _index(model, *fields):
+    """
+    Name of the ``Meta.indexes`` entry of ``model`` on ``fields``.
+    """
+    for index in model._meta.indexes:
+        if tuple(index.fields) == fields:
+            return index.name
+    raise LookupError(f'{model.__name__} has no index on {fields}')
+
+
+def _foreign_key_index(model, field_name):
+    # The name Django gives the index it creates for a foreign key
+    column = model._meta.get_field(field_name).column
+    return connection.schema_editor()._create_index_name(model._meta.db_table, [column], suffix='')
+
+
+def hot_queries():
+    """
+    ``{endpoint: (queryset, index name)}`` for the per-user listings, built
+    the way their views build them, for an existing owner where there is one.
+    """
+    employee_id = _sample(Employee, 'id', 0)
+    staff_id = _sample(Employee, 'staff_id', '')
+    user_id = _sample(Employee, 'user_id', 0)
+    chat_id = _sample(Chat, 'id', 0)
+    thread_id = _sample(ChatThread, 'id', '00000000-0000-0000-0000-000000000000')
+
+    return {
+        'GET /api/employees/notifications/': (
+            Notification.objects.filter(employee_id=employee_id).order_by('-created_at'),
+            _index(Notification, 'employee', '-created_at'),
+        ),
+        'GET /api/employees/chats/': (
+            Chat.objects.filter(employee_id=staff_id).order_by('-updated_at'),
+            _index(Chat, 'employee', '-updated_at'),
+        ),
+        'GET /api/employees/chats/<id>/messages/': (
+            Message.objects.filter(chat_id=chat_id).order_by('created_at'),
+            _index(Message, 'chat', 'created_at'),
+        ),
+        'GET /api/employees/certifications/': (
+            Certification.objects.filter(employee_id=employee_id),
+            _foreign_key_index(Certification, 'employee'),
+        ),
+        'GET /api/recommendations/from-db/': (
+            Recommendation.objects.filter(employee_id=employee_id).order_by('content_type', 'created_at'),
+            _index(Recommendation, 'employee', 'content_type', 'created_at'),
+        ),
+        'GET /api/recommendations_01/videos/': (
+            VideoRecommendation.objects.filter(user_id=user_id),
+            _index(VideoRecommendation, 'user', '-created_at'),
+        ),
+        'GET /api/recommendations_01/courses/': (
+            CourseRecommendation.objects.filter(user_id=user_id),
+            _index(CourseRecommendation, 'user', '-created_at'),
+        ),
+        'GET /api/recommendations_01/articles/': (
+            ArticleRecommendation.objects.filter(user_id=user_id),
+            _index(ArticleRecommendation, 'user', '-created_at'),
+        ),
+        'GET /api/chatbot/threads/': (
+            ChatThread.objects.filter(user_id=user_id),
+            _index(ChatThread, 'user', '-created_at'),
+        ),
+        'GET /api/chatbot/threads/<id>/': (
+            ThreadMessage.objects.filter(thread_id=thread_id).order_by('-id')[:31],
+            _index(ThreadMessage, 'thread', '-id'),
+        ),
+    }
+
+
+def prefer_indexes(cursor):
+    """
+    Makes seq scans and sorts a last resort for the rest of the current
+    transaction, so the planner picks an index whenever one fits, however
+    few rows the tables hold.
+    """
+    cursor.execute('SET LOCAL enable_seqscan = off')
+    cursor.execute('SET LOCAL enable_sort = off')
+
+
+def explain(queryset):
+    # Depending on the driver, EXPLAIN (FORMAT JSON) comes back as the JSON
+    # array or as its single element
+    explained = json.loads(queryset.explain(format='json'))
+    if isinstance(explained, list):
+        explained = explained[0]
+    return explained['Plan']
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from plan_nodes(child)
+
+
+def plan_regressions(endpoint, plan, index):
+    """
+    Descriptions of what in ``plan`` shows ``endpoint`` isn't served by ``index``.
+
+    Seq scans are switched off by ``prefer_indexes``, and the foreign key
+    indexes always offer the planner a way around them, so the index
+    actually used is what tells a regression apart.
+    """
+    unwanted = {'Seq Scan'} if endpoint in SORTED_AFTER_LOOKUP else {'Seq Scan', 'Sort'}
+    nodes = list(plan_nodes(plan))
+    regressions = [
+        f"{node['Node Type']} on {node['Relation Name']}" if 'Relation Name' in node
+        else node['Node Type']
+        for node in nodes
+        if node['Node Type'] in unwanted
+    ]
+    if index not in {node.get('Index Name') for node in nodes}:
+        regressions.append(f'{index} not used')
+    return regressions
+
+
+def index_scans(plan):
+    return sorted({
+        f"{node['Node Type']} using {node['Index Name']}"
+        for node in plan_nodes(plan)
+        if 'Index Name' in node
+    })
@@ -95,6 +95,29 @@ DATABASES = {
     }
 }
 
+# Cache
+# Shared by all workers. Set REDIS_URL to use Redis (requires the redis
+# package); otherwise entries live in a database table created by
+# `python manage.py createcachetable`.
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'growwise_cache',
+            'OPTIONS': {
+                'MAX_ENTRIES': 100000,
+            },
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -174,3 +197,75 @@ GOOGLE_SEARCH_ENGINE_ID = os.getenv("GOOGLE_SEARCH_ENGINE_ID")
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+
+# Recommendation pipeline
+RECOMMENDATION_DEADLINE_SECONDS = float(os.getenv("RECOMMENDATION_DEADLINE_SECONDS", "20"))
+
+# URL validation cache (seconds)
+URL_VALIDATION_TTL = int(os.getenv("URL_VALIDATION_TTL", str(7 * 24 * 3600)))
+URL_VALIDATION_NEGATIVE_TTL = int(os.getenv("URL_VALIDATION_NEGATIVE_TTL", "3600"))
+URL_VALIDATION_CACHE_SIZE = int(os.getenv("URL_VALIDATION_CACHE_SIZE", "10000"))
+
+# Search-result cache (entries kept in-process per worker)
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "5000"))
+
+# Outbound HTTP (apps/recommendations/http_client.py)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+# Optional cap on requests in flight per host and client, as a rate guard for
+# hosts that need one: "host=limit,host=limit". Unlisted hosts are only bound
+# by the connection pool, and HTTP/2 streams share their connection freely.
+HTTP_HOST_CONCURRENCY = {
+    host.strip(): int(limit)
+    for host, _, limit in (
+        item.partition("=") for item in os.getenv("HTTP_HOST_CONCURRENCY", "").split(",") if item.strip()
+    )
+}
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_BACKOFF_SECONDS = float(os.getenv("HTTP_BACKOFF_SECONDS", "0.5"))
+
+# Learning-intent cache (one LLM result per career step and JD revision)
+INTENT_CACHE_TTL = int(os.getenv("INTENT_CACHE_TTL", str(30 * 24 * 3600)))
+INTENT_CACHE_SIZE = int(os.getenv("INTENT_CACHE_SIZE", "512"))
+
+# Chat context (apps/chats/context.py)
+CHAT_CONTEXT_TOKEN_BUDGET = int(os.getenv("CHAT_CONTEXT_TOKEN_BUDGET", "4000"))
+CHAT_CONTEXT_MAX_MESSAGES = int(os.getenv("CHAT_CONTEXT_MAX_MESSAGES", "40"))
+CHAT_SUMMARY_BATCH = int(os.getenv("CHAT_SUMMARY_BATCH", "10"))
+CHAT_SUMMARY_MAX_MESSAGES = int(os.getenv("CHAT_SUMMARY_MAX_MESSAGES", "100"))
+
+# Gemini models kept per process (apps/chats/gemini_service.py)
+GEMINI_MODEL_CACHE_SIZE = int(os.getenv("GEMINI_MODEL_CACHE_SIZE", "256"))
+
+# Provider-side caching of the system instruction (apps/chats/prompt_cache.py):
+# "gemini", "local" (in-process fake) or empty to disable
+GEMINI_PROMPT_CACHE = os.getenv("GEMINI_PROMPT_CACHE", "gemini")
+GEMINI_PROMPT_CACHE_TTL = int(os.getenv("GEMINI_PROMPT_CACHE_TTL", "3600"))
+GEMINI_PROMPT_CACHE_REFRESH_MARGIN = int(os.getenv("GEMINI_PROMPT_CACHE_REFRESH_MARGIN", "600"))
+GEMINI_PROMPT_CACHE_MIN_TOKENS = int(os.getenv("GEMINI_PROMPT_CACHE_MIN_TOKENS", "1024"))
+
+# Employee profile context for the AI chats (apps/employees/context.py)
+EMPLOYEE_CONTEXT_TTL = int(os.getenv("EMPLOYEE_CONTEXT_TTL", str(24 * 3600)))
+
+# Concurrent long-running requests per worker process (core/concurrency.py);
+# 0 disables a limit
+CONCURRENCY_LIMITS = {
+    "chat": int(os.getenv("CHAT_CONCURRENCY_LIMIT", "200")),
+    "recommendations": int(os.getenv("RECOMMENDATION_CONCURRENCY_LIMIT", "20")),
+}
+CONCURRENCY_QUEUE_TIMEOUT = float(os.getenv("CONCURRENCY_QUEUE_TIMEOUT", "10"))
+
+# Async LangGraph checkpointer pool, opened lazily per worker (apps/chatbot/bot.py)
+CHECKPOINT_POOL_MIN_SIZE = int(os.getenv("CHECKPOINT_POOL_MIN_SIZE", "1"))
+CHECKPOINT_POOL_MAX_SIZE = int(os.getenv("CHECKPOINT_POOL_MAX_SIZE", "10"))
+CHECKPOINT_POOL_TIMEOUT = float(os.getenv("CHECKPOINT_POOL_TIMEOUT", "30"))
+CHECKPOINT_POOL_MAX_IDLE = float(os.getenv("CHECKPOINT_POOL_MAX_IDLE", "300"))
+
+# Checkpoints kept per chatbot thread by `manage.py compact_checkpoints`,
+# and how long a thread must be idle before it is compacted
+CHECKPOINT_RETENTION = int(os.getenv("CHECKPOINT_RETENTION", "3"))
+CHECKPOINT_COMPACTION_IDLE_MINUTES = int(os.getenv("CHECKPOINT_COMPACTION_IDLE_MINUTES", "60"))
+
+# Chatbot thread history pages (apps/chatbot/history.py)
+THREAD_HISTORY_PAGE_SIZE = int(os.getenv("THREAD_HISTORY_PAGE_SIZE", "30"))
+THREAD_HISTORY_MAX_PAGE_SIZE = int(os.getenv("THREAD_HISTORY_MAX_PAGE_SIZE", "100"))
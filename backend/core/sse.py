@@ -0,0 +1,41 @@
+"""
+Server-Sent Events helpers shared by the streaming chat endpoints.
+
+Streaming views return ``sse_response(events)`` where ``events`` is an async
+iterator of already formatted ``sse_event(...)`` strings. Served under ASGI
+each event is flushed to the client as soon as it is yielded; if the client
+goes away, Django stops iterating and the generator is closed.
+"""
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+
+def sse_event(event, data):
+    """
+    Formats one SSE message; ``data`` is sent as JSON.
+    """
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def sse_response(events):
+    response = StreamingHttpResponse(events, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx and similar proxies from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Lets streaming views accept ``Accept: text/event-stream``. Regular DRF
+    responses from such views (validation errors, 404s) are sent as a
+    single ``error`` event.
+    """
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return sse_event("error", data)
@@ -0,0 +1,119 @@
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+from apps.certifications.models import Certification
+from apps.chatbot.models import ChatThread, ThreadMessage
+from apps.chats.models import Chat, Message
+from apps.employees.models import Employee
+from core.query_plans import explain, hot_queries, plan_regressions, prefer_indexes
+from apps.notifications.models import Notification
+from apps.organization.models import Department, Designation
+from apps.recommendations.models import Recommendation
+from apps.recommendations_01.models import (
+    ArticleRecommendation,
+    CourseRecommendation,
+    VideoRecommendation,
+)
+
+EMPLOYEES = 20
+ROWS_PER_OWNER = 10
+
+
+def seed():
+    """
+    A small organisation where every employee owns rows in each listed table.
+    """
+    department = Department.objects.create(name="Engineering")
+    designation = Designation.objects.create(name="Engineer", department=department)
+
+    User.objects.bulk_create([User(username=f"employee-{i}") for i in range(EMPLOYEES)])
+    users = list(User.objects.filter(username__startswith="employee-").order_by("id"))
+    Employee.objects.bulk_create([
+        Employee(
+            user=user, staff_id=f"S{i:04d}", name=f"Employee {i}",
+            department=department, designation=designation,
+        )
+        for i, user in enumerate(users)
+    ])
+    employees = list(Employee.objects.order_by("id"))
+
+    rows = range(ROWS_PER_OWNER)
+    Notification.objects.bulk_create([
+        Notification(employee=employee, message=f"Notification {n}")
+        for employee in employees for n in rows
+    ])
+    Certification.objects.bulk_create([
+        Certification(employee=employee, link=f"https://example.com/cert/{employee.pk}/{n}")
+        for employee in employees for n in rows
+    ])
+    Recommendation.objects.bulk_create([
+        Recommendation(
+            employee=employee, title=f"Item {n}", url=f"https://example.com/{n}",
+            content_type=("article", "video", "course")[n % 3], reason="Relevant",
+        )
+        for employee in employees for n in rows
+    ])
+
+    Chat.objects.bulk_create([
+        Chat(employee=employee, name=f"Chat {n}") for employee in employees for n in rows
+    ])
+    Message.objects.bulk_create([
+        Message(chat=chat, role=("user", "assistant")[n % 2], content=f"Message {n}")
+        for chat in Chat.objects.all() for n in rows
+    ])
+
+    for model in (VideoRecommendation, CourseRecommendation, ArticleRecommendation):
+        model.objects.bulk_create([
+            model(
+                user=user, skill="Python", title=f"Item {n}", description="",
+                url=f"https://example.com/{n}", source="example",
+            )
+            for user in users for n in rows
+        ])
+
+    ChatThread.objects.bulk_create([ChatThread(user=user) for user in users for _ in rows])
+    ThreadMessage.objects.bulk_create([
+        ThreadMessage(thread=thread, role=("human", "ai")[n % 2], content=f"Message {n}")
+        for thread in ChatThread.objects.all() for n in rows
+    ])
+
+
+@skipUnless(connection.vendor == "postgresql", "EXPLAIN checks need PostgreSQL")
+class QueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed()
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def test_list_queries_are_served_by_an_index(self):
+        with connection.cursor() as cursor:
+            prefer_indexes(cursor)
+
+        for endpoint, (queryset, index) in hot_queries().items():
+            with self.subTest(endpoint=endpoint):
+                self.assertEqual(plan_regressions(endpoint, explain(queryset), index), [])
+
+    def test_missing_index_is_reported(self):
+        # Filtering on an unindexed column must show up as a regression
+        queryset = Notification.objects.filter(message="Notification 1")
+        _, index = hot_queries()["GET /api/employees/notifications/"]
+        with connection.cursor() as cursor:
+            prefer_indexes(cursor)
+
+        regressions = plan_regressions("GET /api/employees/notifications/", explain(queryset), index)
+        self.assertIn("Seq Scan on notifications", regressions)
+        self.assertIn(f"{index} not used", regressions)
+
+    def test_sorted_lookup_must_use_the_foreign_key_index(self):
+        # Served through the primary key instead: no seq scan, but still a regression
+        endpoint = "GET /api/employees/certifications/"
+        _, index = hot_queries()[endpoint]
+        queryset = Certification.objects.filter(pk__gt=0, link__startswith="https://")
+        with connection.cursor() as cursor:
+            prefer_indexes(cursor)
+
+        self.assertIn(f"{index} not used", plan_regressions(endpoint, explain(queryset), index))
@@ -3,6 +3,7 @@
 echo "Running migrations..."
 python manage.py makemigrations
 python manage.py migrate
+python manage.py createcachetable
 
 echo "Creating superuser if not exists..."
 python manage.py shell -c "
@@ -19,5 +20,8 @@ if not User.objects.filter(username='admin').exists():
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
-echo "Starting Gunicorn..."
-gunicorn core.wsgi:application --bind 0.0.0.0:8000 --timeout 120
+echo "Starting recommendation job worker..."
+python manage.py run_recommendation_jobs &
+
+echo "Starting Gunicorn (ASGI, uvicorn workers)..."
+gunicorn core.asgi:application -k uvicorn_worker.UvicornWorker --bind 0.0.0.0:8000 --timeout 120
@@ -172,7 +172,6 @@ interface Message {
 
 interface Recommendation {
   id: number;
-  employee_id: number;
   title: string;
   url: string;
   thumbnail_url?: string;